@@ -5,24 +5,51 @@ Implements header insertion logic with idempotency, shebang preservation,
 and atomic file writes.
 """
 
+import functools
 import logging
 import os
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from itertools import repeat
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .config import Config, get_header_content
 from .scanner import scan_repository
 from .utils import (
-    extract_shebang,
-    has_shebang,
+    BOM_UTF8,
+    BinaryFileError,
+    detect_bom,
+    forget_bom,
+    read_file_prefix,
+    read_file_prefix_bytes,
     read_file_with_encoding,
+    shebang_end,
     write_file_with_encoding,
+    write_file_with_prefix,
 )
 
 logger = logging.getLogger(__name__)
 
+# Outcomes of applying a header to a single file
+_OUTCOME_MODIFIED = 'modified'
+_OUTCOME_COMPLIANT = 'compliant'
+_OUTCOME_SKIPPED = 'skipped'
+_OUTCOME_FAILED = 'failed'
+
+# Log level used for each outcome
+_OUTCOME_LOG_LEVELS = {
+    _OUTCOME_MODIFIED: logging.INFO,
+    _OUTCOME_COMPLIANT: logging.DEBUG,
+    _OUTCOME_SKIPPED: logging.DEBUG,
+    _OUTCOME_FAILED: logging.ERROR,
+}
+
+# Files larger than this are written by copying the original body bytes after the
+# header instead of re-encoding the whole content
+_LARGE_FILE_THRESHOLD = 256 * 1024
+
 
 @dataclass
 class ApplyResult:
@@ -43,11 +70,37 @@ class ApplyResult:
         )
 
 
+class _StatCache:
+    """
+    Per-run cache of os.stat results, keyed by path string.
+    
+    Each file's stat is needed for BOM detection, choosing the write strategy
+    and preserving permissions; the cache lets all of them share one syscall.
+    """
+    
+    def __init__(self) -> None:
+        self._stats: Dict[str, os.stat_result] = {}
+    
+    def get(self, path: Path) -> os.stat_result:
+        """Return the stat result for path, calling os.stat only on a cache miss."""
+        key = os.fspath(path)
+        stat_info = self._stats.get(key)
+        if stat_info is None:
+            stat_info = self._stats[key] = os.stat(key)
+        return stat_info
+    
+    def invalidate(self, path: Path) -> None:
+        """Forget the stat result for a path that has been rewritten."""
+        self._stats.pop(os.fspath(path), None)
+
+
+@functools.lru_cache(maxsize=8)
 def normalize_header(header: str) -> str:
     """
     Normalize header text for comparison.
     
     Ensures header ends with exactly one newline for consistent comparison.
+    The header is the same for every file in a run, so results are cached.
     
     Args:
         header: Header text to normalize
@@ -69,8 +122,11 @@ def detect_newline_style(content: str) -> str:
     Returns:
         '\r\n' for CRLF, '\n' for LF
     """
-    # Count occurrences of each newline style
+    # Count occurrences of each newline style. Most files have no CRLF at all,
+    # in which case a single pass over the content settles it.
     crlf_count = content.count('\r\n')
+    if not crlf_count:
+        return '\n'
     lf_count = content.count('\n') - crlf_count  # Subtract CRLF to get pure LF count
     
     # Use CRLF if it's the predominant style
@@ -97,6 +153,50 @@ def convert_newlines(text: str, target_newline: str) -> str:
     return text
 
 
+@functools.lru_cache(maxsize=8)
+def _normalize_header_for_newline(header: str, newline_style: str) -> str:
+    """
+    Normalize a header and convert it to the given newline style.
+    
+    Args:
+        header: Header text to normalize
+        newline_style: Target newline style ('\r\n' or '\n')
+        
+    Returns:
+        Normalized header text using the target newline style
+    """
+    return convert_newlines(normalize_header(header), newline_style)
+
+
+@functools.lru_cache(maxsize=32)
+def _header_pattern(header: str) -> Tuple[str, int]:
+    """
+    Prepare a header for matching against file content.
+    
+    Args:
+        header: Header text to look for
+        
+    Returns:
+        Tuple of (normalized LF-only header, longest span the header can occupy
+        in a file if every newline is written as CRLF)
+    """
+    normalized_header = normalize_header(header)
+    return normalized_header, len(normalized_header) + normalized_header.count('\n')
+
+
+def _starts_with_header(content: str, offset: int, normalized_header: str, span: int) -> bool:
+    """
+    Check whether content has the header at the given offset.
+    
+    Only the window the header could occupy is normalized to LF, so the cost is
+    proportional to the header size rather than the file size.
+    """
+    window = content[offset:offset + span]
+    if '\r' in window:
+        window = window.replace('\r\n', '\n')
+    return window.startswith(normalized_header)
+
+
 def has_header(content: str, header: str) -> bool:
     """
     Check if content already has the header.
@@ -111,37 +211,169 @@ def has_header(content: str, header: str) -> bool:
     Returns:
         True if content has the header, False otherwise
     """
-    # Normalize header for comparison (convert to LF-only)
-    normalized_header = normalize_header(header)
-    
-    # Extract shebang if present
-    shebang, remaining = extract_shebang(content)
+    # Normalized header (LF-only) and the widest span it can cover in CRLF content
+    normalized_header, span = _header_pattern(header)
     
-    # Normalize content to LF-only for comparison
-    # This allows matching headers regardless of CRLF vs LF style
-    normalized_remaining = remaining.replace('\r\n', '\n')
+    # Skip past the shebang line if present, without copying the rest of the file
+    start = shebang_end(content)
     
     # Check if remaining content starts with the header
-    if normalized_remaining.startswith(normalized_header):
+    # (CRLF vs LF style is tolerated by _starts_with_header)
+    if _starts_with_header(content, start, normalized_header, span):
         return True
     
-    # Also check with various whitespace variations around the header
-    # to handle cases where there might be extra blank lines
-    lines = normalized_remaining.split('\n')
+    # Also check after skipping leading blank lines, to handle cases where
+    # there might be extra blank lines before the header
+    pos = start
+    while True:
+        newline_idx = content.find('\n', pos)
+        if newline_idx == -1:
+            if content[pos:].strip() == '':
+                # Nothing but whitespace after the shebang
+                return False
+            break
+        if content[pos:newline_idx].strip() != '':
+            break
+        pos = newline_idx + 1
+    
+    if pos == start:
+        # No leading blank lines; already checked above
+        return False
+    
+    # Use exact match with the full normalized header (including trailing newline)
+    return _starts_with_header(content, pos, normalized_header, span)
+
+
+@functools.lru_cache(maxsize=32)
+def _header_bytes_pattern(header: str) -> Optional[bytes]:
+    """
+    Encode the normalized header for byte-level matching.
+    
+    Args:
+        header: Header text to look for
+        
+    Returns:
+        Normalized LF-only header as bytes, or None if the header is not pure ASCII
+        (its bytes would then depend on the file encoding)
+    """
+    normalized_header = normalize_header(header)
+    if not normalized_header.isascii():
+        return None
+    return normalized_header.encode('ascii')
+
+
+def has_header_bytes(raw: bytes, header_bytes: bytes, bom_len: int = 0) -> bool:
+    """
+    Check if raw UTF-8 file bytes already have the header, without decoding them.
     
-    # Skip leading empty lines
-    start_idx = 0
-    while start_idx < len(lines) and lines[start_idx].strip() == '':
-        start_idx += 1
+    Mirrors has_header for an ASCII header, whose bytes are the same in UTF-8
+    content. Leading blank lines are recognized only if they are made of ASCII
+    whitespace, so a True result always agrees with has_header on the decoded
+    content, while False may need confirming with has_header.
     
-    # Reconstruct content without leading whitespace
-    if start_idx < len(lines):
-        content_without_leading_ws = '\n'.join(lines[start_idx:])
-        # Use exact match with the full normalized header (including trailing newline)
-        if content_without_leading_ws.startswith(normalized_header):
+    Args:
+        raw: File content (or a prefix of it) as raw bytes, including any BOM
+        header_bytes: Normalized header (LF line endings, one trailing newline)
+            encoded as ASCII
+        bom_len: Length of the BOM at the start of raw
+        
+    Returns:
+        True if the content has the header, False otherwise
+    """
+    span = len(header_bytes) + header_bytes.count(b'\n')
+    
+    # Skip past the shebang line if present
+    start = bom_len
+    if raw.startswith(b'#!', start):
+        newline_idx = raw.find(b'\n', start + 2)
+        start = len(raw) if newline_idx == -1 else newline_idx + 1
+    
+    # Skip ASCII-whitespace-only leading lines; checking right after the
+    # shebang is covered by the first iteration
+    pos = start
+    while True:
+        window = raw[pos:pos + span]
+        if b'\r' in window:
+            window = window.replace(b'\r\n', b'\n')
+        if window.startswith(header_bytes):
             return True
+        
+        newline_idx = raw.find(b'\n', pos)
+        if newline_idx == -1 or raw[pos:newline_idx].strip():
+            return False
+        pos = newline_idx + 1
+
+
+def has_header_in_prefix(
+    file_path: Path,
+    header: str,
+    bom_info: Optional[Tuple[Optional[bytes], str]] = None
+) -> bool:
+    """
+    Check the start of a file for the header without reading the whole file.
+    
+    The header sits in the first few lines, so only enough bytes to cover it
+    are read (CRLF/UTF-32 widen each char, the slack covers a shebang and
+    leading blank lines). Apply and check both use this, so they agree on a
+    file whose header is present even if later content would not decode.
     
-    return False
+    Args:
+        file_path: Path to the file to check
+        header: Header text to look for
+        bom_info: Result of detect_bom for the file (detected if None)
+        
+    Returns:
+        True if the file has the header; False if it may not, which needs
+        confirming with has_header on the full content
+        
+    Raises:
+        OSError: If file cannot be read
+        BinaryFileError: If file turns out to be binary
+        UnicodeDecodeError: If the start of a non-UTF-8 file cannot be decoded
+    """
+    if bom_info is None:
+        bom_info = detect_bom(file_path)
+    bom = bom_info[0]
+    
+    prefix_size = len(header) * 4 + 512
+    header_bytes = _header_bytes_pattern(header)
+    if header_bytes is not None and bom in (None, BOM_UTF8):
+        # An ASCII header can be compared against UTF-8 bytes directly
+        prefix = read_file_prefix_bytes(file_path, prefix_size, bom_info)
+        return has_header_bytes(prefix, header_bytes, len(bom or b''))
+    return has_header(read_file_prefix(file_path, prefix_size, bom_info), header)
+
+
+def _header_insertion(content: str, header: str) -> Tuple[str, int]:
+    """
+    Compute the text that replaces the start of the content when inserting a header.
+    
+    Args:
+        content: Original file content
+        header: Header text to insert
+        
+    Returns:
+        Tuple of (leading text made of the shebang (if any) followed by the header,
+        offset in content where the original text resumes)
+    """
+    # Detect the newline style of the content
+    newline_style = detect_newline_style(content)
+    
+    # Normalize header to LF first, then convert to match content's newline style
+    normalized_header = _normalize_header_for_newline(header, newline_style)
+    
+    # Locate the shebang if present
+    body_offset = shebang_end(content)
+    if body_offset == 0:
+        # Insert header at start
+        return normalized_header, 0
+    
+    shebang = content[:body_offset]
+    # Insert header after shebang
+    # Ensure shebang ends with newline before adding header
+    if not shebang.endswith('\n') and not shebang.endswith('\r\n'):
+        shebang = shebang + newline_style
+    return shebang + normalized_header, body_offset
 
 
 def insert_header(content: str, header: str) -> str:
@@ -159,28 +391,136 @@ def insert_header(content: str, header: str) -> str:
     Returns:
         New file content with header inserted
     """
-    # Detect the newline style of the content
-    newline_style = detect_newline_style(content)
+    leading, body_offset = _header_insertion(content, header)
+    if body_offset == 0:
+        return leading + content
+    
+    # Swap the shebang for shebang + header in a single allocation, instead of
+    # slicing off the body and concatenating (which copies the body twice).
+    # The shebang is at offset 0, so the first occurrence is the one replaced.
+    return content.replace(content[:body_offset], leading, 1)
+
+
+def _apply_header(
+    file_path: Path,
+    header: str,
+    dry_run: bool,
+    output_dir: Optional[Path],
+    scan_root: Optional[Path],
+    stat_cache: Optional[_StatCache]
+) -> bool:
+    """
+    Apply header to a single file without logging the outcome.
     
-    # Normalize header to LF first, then convert to match content's newline style
-    normalized_header = normalize_header(header)
-    normalized_header = convert_newlines(normalized_header, newline_style)
-    
-    # Extract shebang if present
-    shebang, remaining = extract_shebang(content)
-    
-    # Build new content
-    if shebang:
-        # Insert header after shebang
-        # Ensure shebang ends with newline before adding header
-        if not shebang.endswith('\n') and not shebang.endswith('\r\n'):
-            shebang = shebang + newline_style
-        new_content = shebang + normalized_header + remaining
+    Shared by apply_header_to_file and the apply_headers workers, which
+    leave the logging to their caller.
+    
+    Returns:
+        True if file was modified (or would be, in a dry run), False if already compliant
+    """
+    if stat_cache is None:
+        stat_cache = _StatCache()
+    
+    stat_info = stat_cache.get(file_path)
+    bom_info = detect_bom(file_path, stat_info)
+    
+    # Fast path for compliant files: only the start of the file is read
+    if has_header_in_prefix(file_path, header, bom_info):
+        return False
+    
+    # Read file with encoding detection
+    content, bom, encoding = read_file_with_encoding(file_path, bom_info)
+    
+    # Check if header already present
+    if has_header(content, header):
+        return False
+    
+    # Large UTF-8 files keep their body bytes as-is: only the shebang and header
+    # are encoded, and the rest is copied straight from the original file
+    copy_body = bom in (None, BOM_UTF8) and stat_info.st_size > _LARGE_FILE_THRESHOLD
+    
+    # Insert header
+    if copy_body:
+        leading, body_offset = _header_insertion(content, header)
     else:
-        # Insert header at start
-        new_content = normalized_header + remaining
+        new_content = insert_header(content, header)
+    
+    if dry_run:
+        return True
     
-    return new_content
+    # Determine output path
+    if output_dir:
+        # Write to output directory, preserving relative directory structure
+        if scan_root:
+            try:
+                # Preserve relative path from scan root
+                rel_path = file_path.resolve().relative_to(scan_root.resolve())
+                output_path = output_dir / rel_path
+            except ValueError:
+                # File is not relative to scan root, use basename as fallback
+                output_path = output_dir / file_path.name
+        else:
+            # No scan root provided, use basename
+            output_path = output_dir / file_path.name
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    else:
+        output_path = file_path
+    
+    # Write atomically using temporary file
+    # Create temp file in same directory as target to ensure same filesystem
+    temp_fd, temp_path = tempfile.mkstemp(
+        dir=output_path.parent,
+        prefix=f'.{output_path.name}.',
+        suffix='.tmp'
+    )
+    
+    try:
+        # Close the fd, we'll use our own write function
+        os.close(temp_fd)
+        
+        # Write new content to temp file
+        if copy_body:
+            bom_bytes = bom or b''
+            body_byte_offset = len(bom_bytes) + len(content[:body_offset].encode('utf-8'))
+            write_file_with_prefix(
+                Path(temp_path),
+                bom_bytes + leading.encode('utf-8'),
+                file_path,
+                body_byte_offset,
+            )
+        else:
+            write_file_with_encoding(Path(temp_path), new_content, bom, encoding)
+        
+        # Preserve file permissions if modifying in-place
+        if not output_dir:
+            try:
+                os.chmod(temp_path, stat_info.st_mode)
+            except (OSError, AttributeError):
+                # If we can't preserve permissions, continue anyway
+                pass
+        
+        # Atomic rename
+        os.replace(temp_path, output_path)
+        stat_cache.invalidate(output_path)
+        forget_bom(output_path)
+        return True
+        
+    except Exception as e:
+        # Clean up temp file on error
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _outcome_message(file_path: Path, outcome: str, dry_run: bool) -> str:
+    """Return the message logged for a modified or already compliant file."""
+    if outcome == _OUTCOME_COMPLIANT:
+        return f"File already has header: {file_path}"
+    if dry_run:
+        return f"[DRY RUN] Would add header to: {file_path}"
+    return f"Added header to: {file_path}"
 
 
 def apply_header_to_file(
@@ -188,7 +528,8 @@ def apply_header_to_file(
     header: str,
     dry_run: bool = False,
     output_dir: Optional[Path] = None,
-    scan_root: Optional[Path] = None
+    scan_root: Optional[Path] = None,
+    stat_cache: Optional[_StatCache] = None
 ) -> bool:
     """
     Apply header to a single file.
@@ -201,6 +542,7 @@ def apply_header_to_file(
         dry_run: If True, don't actually modify files
         output_dir: If provided, write to this directory instead of in-place
         scan_root: Root path used for scanning (needed to preserve relative paths in output_dir)
+        stat_cache: Stat cache shared across a run (a private one is used if None)
         
     Returns:
         True if file was modified, False if already compliant or skipped
@@ -208,85 +550,55 @@ def apply_header_to_file(
     Raises:
         OSError: If file cannot be read or written
         PermissionError: If file cannot be accessed
+        BinaryFileError: If file turns out to be binary
     """
     try:
-        # Read file with encoding detection
-        content, bom, encoding = read_file_with_encoding(file_path)
-        
-        # Check if header already present
-        if has_header(content, header):
-            logger.debug(f"File already has header: {file_path}")
-            return False
-        
-        # Insert header
-        new_content = insert_header(content, header)
-        
-        if dry_run:
-            logger.info(f"[DRY RUN] Would add header to: {file_path}")
-            return True
-        
-        # Determine output path
-        if output_dir:
-            # Write to output directory, preserving relative directory structure
-            if scan_root:
-                try:
-                    # Preserve relative path from scan root
-                    rel_path = file_path.resolve().relative_to(scan_root.resolve())
-                    output_path = output_dir / rel_path
-                except ValueError:
-                    # File is not relative to scan root, use basename as fallback
-                    output_path = output_dir / file_path.name
-            else:
-                # No scan root provided, use basename
-                output_path = output_dir / file_path.name
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-        else:
-            output_path = file_path
-        
-        # Write atomically using temporary file
-        # Create temp file in same directory as target to ensure same filesystem
-        temp_fd, temp_path = tempfile.mkstemp(
-            dir=output_path.parent,
-            prefix=f'.{output_path.name}.',
-            suffix='.tmp'
-        )
-        
-        try:
-            # Close the fd, we'll use our own write function
-            os.close(temp_fd)
-            
-            # Write new content to temp file
-            write_file_with_encoding(Path(temp_path), new_content, bom, encoding)
-            
-            # Preserve file permissions if modifying in-place
-            if not output_dir:
-                try:
-                    stat_info = os.stat(file_path)
-                    os.chmod(temp_path, stat_info.st_mode)
-                except (OSError, AttributeError):
-                    # If we can't preserve permissions, continue anyway
-                    pass
-            
-            # Atomic rename
-            os.replace(temp_path, output_path)
-            
-            logger.info(f"Added header to: {file_path}")
-            return True
-            
-        except Exception as e:
-            # Clean up temp file on error
-            try:
-                os.unlink(temp_path)
-            except OSError:
-                pass
-            raise
-    
+        was_modified = _apply_header(file_path, header, dry_run, output_dir, scan_root, stat_cache)
     except PermissionError as e:
         logger.error(f"Permission denied accessing {file_path}: {e}")
         raise
     except (OSError, IOError) as e:
         logger.error(f"Error processing {file_path}: {e}")
         raise
+    
+    outcome = _OUTCOME_MODIFIED if was_modified else _OUTCOME_COMPLIANT
+    logger.log(_OUTCOME_LOG_LEVELS[outcome], _outcome_message(file_path, outcome, dry_run))
+    return was_modified
+
+
+def _apply_header_worker(
+    file_path: Path,
+    header: str,
+    dry_run: bool,
+    scan_root: Path,
+    stat_cache: Optional[_StatCache] = None
+) -> Tuple[Path, str, str]:
+    """
+    Apply header to a single file, capturing expected failures.
+    
+    Runs either in-process or in a worker process, so nothing is logged here:
+    failures are returned rather than raised, and the caller logs the message
+    so that output stays in input order whatever the number of workers.
+    
+    Returns:
+        Tuple of (file path, outcome, log message)
+    """
+    try:
+        was_modified = _apply_header(
+            file_path,
+            header,
+            dry_run,
+            output_dir=None,  # Always modify in-place
+            scan_root=scan_root,
+            stat_cache=stat_cache
+        )
+    except BinaryFileError:
+        return file_path, _OUTCOME_SKIPPED, f"Skipping binary file: {file_path}"
+    except (PermissionError, OSError, IOError, UnicodeDecodeError) as e:
+        return file_path, _OUTCOME_FAILED, f"Failed to process {file_path}: {e}"
+    
+    outcome = _OUTCOME_MODIFIED if was_modified else _OUTCOME_COMPLIANT
+    return file_path, outcome, _outcome_message(file_path, outcome, dry_run)
 
 
 def apply_headers(config: Config) -> ApplyResult:
@@ -317,28 +629,46 @@ def apply_headers(config: Config) -> ApplyResult:
         include_extensions=config.include_extensions,
         exclude_patterns=config.exclude_paths,
         repo_root=repo_root,
+        jobs=config.jobs,
+        trust_extensions=config.trust_extensions,
     )
     
     logger.info(f"Found {len(scan_result.eligible_files)} eligible files")
     
     # Apply header to each eligible file (always in-place, never copying to output dir)
-    for file_path in scan_result.eligible_files:
-        try:
-            was_modified = apply_header_to_file(
-                file_path=file_path,
-                header=header,
-                dry_run=config.dry_run,
-                output_dir=None,  # Always modify in-place
-                scan_root=scan_path
-            )
-            
-            if was_modified:
-                result.modified_files.append(file_path)
-            else:
-                result.already_compliant.append(file_path)
-                
-        except (PermissionError, OSError, IOError, UnicodeDecodeError) as e:
-            logger.error(f"Failed to process {file_path}: {e}")
+    eligible_files = scan_result.eligible_files
+    jobs = min(config.jobs, len(eligible_files))
+    if jobs > 1:
+        # Files are independent, so spread them over worker processes. map()
+        # preserves input order, keeping results deterministic.
+        logger.info(f"Applying headers using {jobs} worker processes")
+        chunksize = max(1, len(eligible_files) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            outcomes = list(executor.map(
+                _apply_header_worker,
+                eligible_files,
+                repeat(header),
+                repeat(config.dry_run),
+                repeat(scan_path),
+                chunksize=chunksize,
+            ))
+    else:
+        stat_cache = _StatCache()
+        outcomes = (
+            _apply_header_worker(file_path, header, config.dry_run, scan_path, stat_cache)
+            for file_path in eligible_files
+        )
+    
+    # All per-file logging happens here, in the parent, in input order
+    for file_path, outcome, message in outcomes:
+        logger.log(_OUTCOME_LOG_LEVELS[outcome], message)
+        if outcome == _OUTCOME_MODIFIED:
+            result.modified_files.append(file_path)
+        elif outcome == _OUTCOME_COMPLIANT:
+            result.already_compliant.append(file_path)
+        elif outcome == _OUTCOME_SKIPPED:
+            result.skipped_files.append(file_path)
+        else:
             result.failed_files.append(file_path)
     
     # Track skipped files from scan
@@ -11,8 +11,8 @@ from typing import List
 
 from .config import Config, get_header_content
 from .scanner import scan_repository
-from .apply import has_header
-from .utils import read_file_with_encoding
+from .apply import has_header, has_header_in_prefix
+from .utils import BinaryFileError, detect_bom, read_file_with_encoding
 
 logger = logging.getLogger(__name__)
 
@@ -58,10 +58,16 @@ def check_file_header(file_path: Path, header: str) -> bool:
     Raises:
         OSError: If file cannot be read
         UnicodeDecodeError: If file encoding cannot be determined
+        BinaryFileError: If file turns out to be binary
     """
     try:
+        # Fast path for compliant files, shared with apply so both agree
+        bom_info = detect_bom(file_path)
+        if has_header_in_prefix(file_path, header, bom_info):
+            return True
+        
         # Read file with encoding detection
-        content, bom, encoding = read_file_with_encoding(file_path)
+        content, bom, encoding = read_file_with_encoding(file_path, bom_info)
         
         # Check if header is present
         return has_header(content, header)
@@ -102,6 +108,8 @@ def check_headers(config: Config) -> CheckResult:
         include_extensions=config.include_extensions,
         exclude_patterns=config.exclude_paths,
         repo_root=repo_root,
+        jobs=config.jobs,
+        trust_extensions=config.trust_extensions,
     )
     
     logger.info(f"Found {len(scan_result.eligible_files)} eligible files")
@@ -118,6 +126,9 @@ def check_headers(config: Config) -> CheckResult:
                 result.non_compliant_files.append(file_path)
                 logger.info(f"File is missing header: {file_path}")
                 
+        except BinaryFileError:
+            logger.debug(f"Skipping binary file: {file_path}")
+            result.skipped_files.append(file_path)
         except (PermissionError, OSError, IOError, UnicodeDecodeError) as e:
             logger.error(f"Failed to check {file_path}: {e}")
             result.failed_files.append(file_path)
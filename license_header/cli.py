@@ -6,7 +6,7 @@ import logging
 import sys
 import click
 
-from .config import merge_config, get_header_content
+from .config import Config, merge_config, get_header_content
 from .apply import apply_headers
 from .check import check_headers
 from .reports import generate_reports
@@ -35,6 +35,30 @@ def check_python_version():
         sys.exit(1)
 
 
+def echo_config(cfg: Config, header_content: str) -> None:
+    """
+    Display the merged configuration before running a command.
+    
+    Args:
+        cfg: Merged configuration
+        header_content: Loaded header content
+    """
+    click.echo(f"Configuration loaded successfully:")
+    click.echo(f"  Header file: {cfg.header_file}")
+    click.echo(f"  Target path: {cfg.path}")
+    click.echo(f"  Include extensions: {', '.join(cfg.include_extensions)}")
+    click.echo(f"  Exclude paths: {', '.join(cfg.exclude_paths)}")
+    if cfg.output_dir:
+        click.echo(f"  Output directory: {cfg.output_dir}")
+    click.echo(f"  Dry run: {cfg.dry_run}")
+    if cfg.jobs > 1:
+        click.echo(f"  Jobs: {cfg.jobs}")
+    if cfg.trust_extensions:
+        click.echo(f"  Trust extensions: {cfg.trust_extensions}")
+    click.echo(f"  Header content loaded: {len(header_content)} characters")
+    click.echo()
+
+
 @click.group()
 @click.version_option(message='%(version)s')
 def main():
@@ -54,7 +78,9 @@ def main():
 @click.option('--include-extension', multiple=True, help='File extensions to include (e.g., .py, .js). Can be specified multiple times.')
 @click.option('--exclude-path', multiple=True, help='Paths/patterns to exclude (e.g., node_modules). Can be specified multiple times.')
 @click.option('--dry-run', is_flag=True, help='Preview changes without modifying files')
-def apply(config, header, path, output, include_extension, exclude_path, dry_run):
+@click.option('--jobs', type=int, help='Number of workers used to scan and apply headers (default: 1)')
+@click.option('--trust-extensions', is_flag=True, default=None, help='Skip binary detection for files with well-known text extensions')
+def apply(config, header, path, output, include_extension, exclude_path, dry_run, jobs, trust_extensions):
     """Apply license headers to source files (modifies files in-place)."""
     logger.info(f"Apply command called with path='{path}', dry_run={dry_run}")
     
@@ -68,6 +94,8 @@ def apply(config, header, path, output, include_extension, exclude_path, dry_run
             'exclude_path': list(exclude_path) if exclude_path else None,
             'dry_run': dry_run,
             'mode': 'apply',
+            'jobs': jobs,
+            'trust_extensions': trust_extensions,
         }
         
         # Merge configuration
@@ -77,16 +105,7 @@ def apply(config, header, path, output, include_extension, exclude_path, dry_run
         header_content = get_header_content(cfg)
         
         # Display configuration
-        click.echo(f"Configuration loaded successfully:")
-        click.echo(f"  Header file: {cfg.header_file}")
-        click.echo(f"  Target path: {cfg.path}")
-        click.echo(f"  Include extensions: {', '.join(cfg.include_extensions)}")
-        click.echo(f"  Exclude paths: {', '.join(cfg.exclude_paths)}")
-        if cfg.output_dir:
-            click.echo(f"  Output directory: {cfg.output_dir}")
-        click.echo(f"  Dry run: {cfg.dry_run}")
-        click.echo(f"  Header content loaded: {len(header_content)} characters")
-        click.echo()
+        echo_config(cfg, header_content)
         
         # Apply headers
         logger.info("Applying license headers...")
@@ -154,7 +173,9 @@ def apply(config, header, path, output, include_extension, exclude_path, dry_run
 @click.option('--include-extension', multiple=True, help='File extensions to include (e.g., .py, .js). Can be specified multiple times.')
 @click.option('--exclude-path', multiple=True, help='Paths/patterns to exclude (e.g., node_modules). Can be specified multiple times.')
 @click.option('--dry-run', is_flag=True, help='Preview results without generating reports')
-def check(config, header, path, output, include_extension, exclude_path, dry_run):
+@click.option('--jobs', type=int, help='Number of threads used to scan for files (default: 1)')
+@click.option('--trust-extensions', is_flag=True, default=None, help='Skip binary detection for files with well-known text extensions')
+def check(config, header, path, output, include_extension, exclude_path, dry_run, jobs, trust_extensions):
     """Check source files for correct license headers."""
     logger.info(f"Check command called with path='{path}', dry_run={dry_run}")
     
@@ -168,6 +189,8 @@ def check(config, header, path, output, include_extension, exclude_path, dry_run
             'exclude_path': list(exclude_path) if exclude_path else None,
             'dry_run': dry_run,
             'mode': 'check',
+            'jobs': jobs,
+            'trust_extensions': trust_extensions,
         }
         
         # Merge configuration
@@ -177,16 +200,7 @@ def check(config, header, path, output, include_extension, exclude_path, dry_run
         header_content = get_header_content(cfg)
         
         # Display configuration
-        click.echo(f"Configuration loaded successfully:")
-        click.echo(f"  Header file: {cfg.header_file}")
-        click.echo(f"  Target path: {cfg.path}")
-        click.echo(f"  Include extensions: {', '.join(cfg.include_extensions)}")
-        click.echo(f"  Exclude paths: {', '.join(cfg.exclude_paths)}")
-        if cfg.output_dir:
-            click.echo(f"  Output directory: {cfg.output_dir}")
-        click.echo(f"  Dry run: {cfg.dry_run}")
-        click.echo(f"  Header content loaded: {len(header_content)} characters")
-        click.echo()
+        echo_config(cfg, header_content)
         
         # Check headers
         logger.info("Checking license headers...")
@@ -4,6 +4,8 @@ Configuration module for license-header tool.
 Handles loading and merging configuration from CLI arguments and config files.
 """
 
+import copy
+import functools
 import json
 import logging
 from dataclasses import dataclass, field
@@ -30,6 +32,8 @@ class Config:
     mode: str = 'apply'  # 'apply' or 'check'
     path: str = '.'
     strict: bool = False
+    jobs: int = 1  # Apply worker processes and scanner directory-listing threads
+    trust_extensions: bool = False  # Skip binary detection for known text extensions
     
     # Resolved paths (computed after loading)
     _header_content: Optional[str] = field(default=None, init=False, repr=False)
@@ -61,10 +65,34 @@ def find_repo_root(start_path: Path) -> Path:
     return start_path.resolve()
 
 
+@functools.lru_cache(maxsize=32)
+def _parse_config_file(path: str, mtime_ns: int, size: int) -> dict:
+    """
+    Parse a JSON configuration file.
+    
+    Cached on the file's (mtime, size), so repeated merges in one process parse
+    an unchanged file only once. Callers must not mutate the returned dict.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_header_file(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Read a header file, cached on the file's (mtime, size).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
 def load_config_file(config_path: Path) -> dict:
     """
     Load configuration from a JSON file.
     
+    Parsed files are cached until they change on disk; each call returns its
+    own copy of the data.
+    
     Args:
         config_path: Path to the configuration file
         
@@ -75,8 +103,10 @@ def load_config_file(config_path: Path) -> dict:
         click.ClickException: If the file cannot be read or parsed
     """
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
+        stat_info = config_path.stat()
+        config_data = copy.deepcopy(
+            _parse_config_file(str(config_path), stat_info.st_mtime_ns, stat_info.st_size)
+        )
         logger.info(f"Loaded configuration from {config_path}")
         return config_data
     except FileNotFoundError:
@@ -147,8 +177,8 @@ def load_header_content(header_file: str, repo_root: Path) -> str:
     
     # Read header content
     try:
-        with open(header_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        stat_info = header_path.stat()
+        content = _read_header_file(str(header_path), stat_info.st_mtime_ns, stat_info.st_size)
         logger.info(f"Loaded header content from {header_path}")
         return content
     except Exception as e:
@@ -188,6 +218,23 @@ def validate_exclude_patterns(patterns: List[str]) -> None:
             )
 
 
+def validate_jobs(jobs: int) -> None:
+    """
+    Validate the number of jobs.
+    
+    The same value sets the worker processes used by apply and the threads
+    used to list directories when scanning for apply and check.
+    
+    Args:
+        jobs: Number of jobs
+        
+    Raises:
+        click.ClickException: If jobs is not a positive integer
+    """
+    if isinstance(jobs, bool) or not isinstance(jobs, int) or jobs < 1:
+        raise click.ClickException(f"Invalid jobs value '{jobs}': must be a positive integer.")
+
+
 def merge_config(
     cli_args: dict,
     config_file_path: Optional[str] = None,
@@ -222,6 +269,8 @@ def merge_config(
         'mode': 'apply',
         'path': '.',
         'strict': False,
+        'jobs': 1,
+        'trust_extensions': False,
     }
     
     # Load config file if specified or if default exists
@@ -243,7 +292,7 @@ def merge_config(
     # Merge: config file overrides defaults
     if config_file_data:
         # Map config file keys to internal keys
-        for key in ['include_extensions', 'exclude_paths', 'output_dir', 'header_file']:
+        for key in ['include_extensions', 'exclude_paths', 'output_dir', 'header_file', 'jobs', 'trust_extensions']:
             if key in config_file_data and config_file_data[key] is not None:
                 config_data[key] = config_file_data[key]
     
@@ -281,6 +330,11 @@ def merge_config(
     # Validate and warn about extensions and patterns
     validate_extensions(config_data['include_extensions'])
     validate_exclude_patterns(config_data['exclude_paths'])
+    validate_jobs(config_data['jobs'])
+    if not isinstance(config_data['trust_extensions'], bool):
+        raise click.ClickException(
+            f"Invalid trust_extensions value '{config_data['trust_extensions']}': must be true or false."
+        )
     
     # Create Config object
     config = Config(
@@ -292,6 +346,8 @@ def merge_config(
         mode=config_data.get('mode', 'apply'),
         path=config_data.get('path', '.'),
         strict=config_data.get('strict', False),
+        jobs=config_data['jobs'],
+        trust_extensions=config_data['trust_extensions'],
     )
     
     # Store repo root
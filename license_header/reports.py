@@ -32,8 +32,19 @@ def _format_file_list(files: List[Path], repo_root: Optional[Path] = None, limit
     formatted = []
     files_to_format = files[:limit] if limit else files
     
+    # Paths under the repository root can be made relative by slicing off the
+    # root's string form, without comparing parts in Path.relative_to
+    prefix = None
+    if repo_root:
+        root_str = os.fspath(repo_root)
+        prefix = root_str if root_str.endswith(os.sep) else root_str + os.sep
+    
     for file_path in files_to_format:
-        if repo_root:
+        path_str = os.fspath(file_path)
+        rest = path_str[len(prefix):] if prefix is not None and path_str.startswith(prefix) else ''
+        if rest and not rest.startswith(os.sep):
+            formatted.append(rest)
+        elif repo_root:
             try:
                 rel_path = file_path.relative_to(repo_root)
                 formatted.append(str(rel_path))
@@ -41,7 +52,7 @@ def _format_file_list(files: List[Path], repo_root: Optional[Path] = None, limit
                 # File is not relative to repo root
                 formatted.append(str(file_path))
         else:
-            formatted.append(str(file_path))
+            formatted.append(path_str)
     
     return formatted
 
@@ -5,11 +5,17 @@ Provides deterministic repository traversal to identify eligible source files
 based on configured extensions, excludes, and binary detection.
 """
 
+import fnmatch
+import functools
 import logging
 import os
-from dataclasses import dataclass, field
-from pathlib import Path
-from typing import List
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, fields
+from pathlib import Path, PurePath
+from typing import Callable, FrozenSet, Iterator, List, Optional, Tuple
+
+from .utils import sniff_prefix
 
 logger = logging.getLogger(__name__)
 
@@ -50,94 +56,298 @@ class ScanResult:
         )
 
 
-def is_binary_file(file_path: Path) -> bool:
+def is_binary_file(file_path: Path, dir_fd: Optional[int] = None) -> bool:
     """
     Detect if a file is binary by checking for null bytes in the first chunk.
     
     BOM-encoded text files (UTF-16/UTF-32) are treated as text even though they
     contain null bytes as part of their character encoding.
     
+    The file is opened once and only its first chunk is read, whatever its
+    size; the BOM is taken from the same chunk and cached for later reads.
+    
     Args:
         file_path: Path to the file to check
+        dir_fd: Optional descriptor of the file's directory; if given, the file
+            is opened by name relative to it instead of by its full path
         
     Returns:
         True if file appears to be binary, False otherwise
     """
     try:
-        from license_header.utils import detect_bom
-        
-        # Check for BOM first - if present, it's a text file with specific encoding
-        bom, encoding = detect_bom(file_path)
-        if bom is not None:
-            # File has BOM, treat as text
-            return False
-        
-        # Read first 8KB to check for binary content
-        with open(file_path, 'rb') as f:
-            chunk = f.read(8192)
-            # Check for null bytes which indicate binary content
-            return b'\x00' in chunk
-    except (OSError, IOError) as e:
+        _, is_binary = sniff_prefix(file_path, dir_fd)
+    except OSError as e:
         logger.warning(f"Could not read file for binary detection {file_path}: {e}")
         # If we can't read it, treat it as binary to be safe
         return True
+    
+    return is_binary
+
 
+# Extensions whose files are treated as text without reading them when a scan
+# is asked to trust extensions (binary content is still caught when the file
+# is read to check or apply its header)
+_KNOWN_TEXT_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.md', '.txt', '.rs', '.go', '.c', '.h', '.cpp',
+    '.hpp', '.java', '.cs', '.rb', '.html', '.css', '.yaml', '.yml', '.toml',
+    '.json',
+})
 
 # Recursive wildcard prefix used in glob patterns
 _RECURSIVE_PREFIX = '**/'
 
+# Path.match() compares case-insensitively on Windows
+_GLOB_FLAGS = re.IGNORECASE if os.name == 'nt' else 0
+
+# Separators PurePath splits path components on
+_PATH_SEPARATORS = ('/', '\\') if os.name == 'nt' else ('/',)
+
 
-def _try_directory_patterns(rel_path: Path, pattern: str) -> bool:
+def _translate_glob_part(part: str) -> str:
     """
-    Try matching a pattern as a directory by adding directory wildcards.
+    Translate a single glob path component into a regex fragment.
+    
+    Wildcards never match '/', so the fragment matches exactly one path
+    component, like fnmatch does for each part in Path.match().
     
     Args:
-        rel_path: Path relative to repository root
-        pattern: Pattern to try
+        part: One component of a glob pattern
         
     Returns:
-        True if any directory variant matches, False otherwise
+        Regex fragment matching that component
     """
-    # Try both recursive and single-level directory patterns
-    for suffix in ('/**', '/*'):
-        if rel_path.match(pattern + suffix):
-            return True
-    return False
+    res = []
+    i, n = 0, len(part)
+    while i < n:
+        c = part[i]
+        i += 1
+        if c == '*':
+            # Consecutive stars behave like a single one within a component
+            while i < n and part[i] == '*':
+                i += 1
+            res.append('[^/]*')
+        elif c == '?':
+            res.append('[^/]')
+        elif c == '[':
+            # Find the end of the bracket expression the same way fnmatch does
+            j = i
+            if j < n and part[j] == '!':
+                j += 1
+            if j < n and part[j] == ']':
+                j += 1
+            while j < n and part[j] != ']':
+                j += 1
+            if j >= n:
+                res.append('\\[')
+            else:
+                # Let fnmatch translate the character set itself
+                char_set = fnmatch.translate(part[i - 1:j + 1])[len('(?s:'):-len(')\\Z')]
+                res.append('(?!/)' + char_set)
+                i = j + 1
+        else:
+            res.append(re.escape(c))
+    return ''.join(res)
 
 
-def _matches_glob_pattern(rel_path: Path, pattern: str) -> bool:
+def _glob_regex(pattern: str, directory: bool) -> str:
     """
-    Check if a relative path matches a glob pattern.
+    Translate a glob pattern into a regex with Path.match() semantics.
     
-    Handles both explicit glob patterns and directory-based patterns by trying
-    multiple variations.
+    Relative patterns match from the right: the last components of the path
+    must match the pattern components one for one.
     
     Args:
-        rel_path: Path relative to repository root
-        pattern: Glob pattern to match against
+        pattern: Glob pattern to translate
+        directory: If True, also require one more component after the pattern
+            (the pattern names a directory containing the path)
         
     Returns:
-        True if the path matches the pattern, False otherwise
+        Regex source to be searched against a '/'-joined relative path
     """
-    # Direct match
-    if rel_path.match(pattern):
-        return True
+    parts = PurePath(pattern).parts
+    body = '/'.join(_translate_glob_part(part) for part in parts)
+    if directory:
+        body += '/[^/]+'
+    return '(?:^|/)' + body + '\\Z'
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_exclude_parts(
+    exclude_patterns: Tuple[str, ...]
+) -> Tuple[bool, Optional[Callable[[str], Optional[re.Match]]], FrozenSet[str]]:
+    """
+    Compile exclude patterns into a glob regex and a set of directory names.
+    
+    Patterns can be:
+    - Simple directory names (e.g., 'node_modules') - matches if directory appears anywhere in path
+    - Glob patterns (e.g., '*.pyc', 'generated/*.py', '**/vendor') - uses glob semantics
+    
+    All glob variants of all patterns are combined into one regex alternation,
+    so each path is checked with a single regex search instead of several
+    Path.match() calls per pattern. Simple names are kept in a set, since a
+    name matching any component also covers the glob variants of a pattern
+    without wildcards. Results are cached per pattern tuple, so repeated scans
+    with the same excludes compile them once.
+    
+    Args:
+        exclude_patterns: Tuple of exclude patterns/globs
+        
+    Returns:
+        Tuple of (whether every path matches, search function of the glob regex
+        or None if there are no glob patterns, directory names to match exactly)
+    """
+    glob_alternatives = []
+    names = set()
+    match_all = False
+    # User patterns often repeat the defaults, so translate each pattern once
+    for pattern in dict.fromkeys(exclude_patterns):
+        # Also check if pattern is a simple directory name that appears in the path
+        # This ensures backward compatibility with simple patterns like 'node_modules'
+        # which should match any occurrence of that directory in the path.
+        # A path component never contains a separator, so such patterns can't match.
+        is_name = bool(pattern) and not any(sep in pattern for sep in _PATH_SEPARATORS)
+        if is_name:
+            names.add(pattern)
+        
+        pure_pattern = PurePath(pattern)
+        if not pure_pattern.parts:
+            # Path.match() rejects empty patterns, which has always excluded everything
+            match_all = True
+            continue
+        if pure_pattern.anchor:
+            # Absolute patterns never match a relative path
+            continue
+        if is_name and not _GLOB_FLAGS and not any(c in pattern for c in '*?['):
+            # A literal name's glob variants only match paths it already matches
+            # (comparison is exact on this platform)
+            continue
+        
+        # Direct match
+        glob_alternatives.append(_glob_regex(pattern, directory=False))
+        
+        # For patterns that don't end with wildcards, also try matching as directory patterns
+        # This allows patterns like 'vendor' or '**/vendor' to match 'vendor/file.js'
+        if not pattern.endswith('*'):
+            glob_alternatives.append(_glob_regex(pattern, directory=True))
+            
+            # For patterns starting with **, also try without the ** prefix
+            # This handles cases like '**/vendor' matching 'vendor/file.js' at root
+            if pattern.startswith(_RECURSIVE_PREFIX):
+                stripped_pattern = pattern[len(_RECURSIVE_PREFIX):]
+                if PurePath(stripped_pattern).parts:
+                    glob_alternatives.append(_glob_regex(stripped_pattern, directory=True))
+    
+    glob_search = None
+    if glob_alternatives:
+        # Only glob matching follows the platform's case sensitivity;
+        # directory names are always compared exactly
+        # (variants shared by several patterns are searched for once)
+        glob_search = re.compile('|'.join(dict.fromkeys(glob_alternatives)), _GLOB_FLAGS).search
+    return match_all, glob_search, frozenset(names)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_excludes(exclude_patterns: Tuple[str, ...]) -> Callable[[str], bool]:
+    """
+    Compile exclude patterns into a single matcher.
     
-    # For patterns that don't end with wildcards, also try matching as directory patterns
-    # This allows patterns like 'vendor' or '**/vendor' to match 'vendor/file.js'
-    if not pattern.endswith('*'):
-        # Try the pattern as a directory
-        if _try_directory_patterns(rel_path, pattern):
+    Args:
+        exclude_patterns: Tuple of exclude patterns/globs
+        
+    Returns:
+        Function taking a path relative to the repository root, as a
+        '/'-separated string ('' for the root itself), and returning True if it
+        matches any pattern
+    """
+    match_all, glob_search, names = _compile_exclude_parts(exclude_patterns)
+    if match_all:
+        return lambda rel_path: True
+    if glob_search is None and not names:
+        return lambda rel_path: False
+    
+    def matches(rel_path: str) -> bool:
+        # The repository root itself never matches a pattern
+        if not rel_path:
+            return False
+        if names and not names.isdisjoint(rel_path.split('/')):
             return True
+        return glob_search is not None and glob_search(rel_path) is not None
+    
+    return matches
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_entry_excludes(exclude_patterns: Tuple[str, ...]) -> Callable[[str, str], bool]:
+    """
+    Compile exclude patterns into a matcher for entries of a non-excluded directory.
+    
+    No component of the parent directory's path matches a simple name, or the
+    directory would have been excluded, so only the entry's own name needs
+    checking against them: a single set lookup instead of a regex search.
+    
+    Args:
+        exclude_patterns: Tuple of exclude patterns/globs
+        
+    Returns:
+        Function taking an entry's path relative to the repository root (as a
+        '/'-separated string) and its name, and returning True if the entry
+        matches any pattern
+    """
+    match_all, glob_search, names = _compile_exclude_parts(exclude_patterns)
+    if match_all:
+        return lambda rel_path, name: True
+    if glob_search is None:
+        return lambda rel_path, name: name in names
+    
+    def matches(rel_path: str, name: str) -> bool:
+        return name in names or glob_search(rel_path) is not None
+    
+    return matches
+
+
+def _join_rel(rel_dir: str, name: str) -> str:
+    """Append a name to a '/'-separated relative path ('' is the root)."""
+    return rel_dir + '/' + name if rel_dir else name
+
+
+def _relative_posix(path: Path, abs_repo_root: Path) -> Optional[str]:
+    """
+    Get a path relative to the repository root as a '/'-separated string.
+    
+    Args:
+        path: Path to convert (can be relative or absolute)
+        abs_repo_root: Resolved repository root path
+        
+    Returns:
+        Relative path ('' for the root itself), or None if path is not within
+        the repository root
+    """
+    try:
+        # Resolve the path to absolute to ensure relative_to works correctly
+        return '/'.join(path.resolve().relative_to(abs_repo_root).parts)
+    except ValueError:
+        return None
+
+
+def _is_excluded(path: Path, abs_repo_root: Path, matcher: Callable[[str], bool]) -> bool:
+    """
+    Check a path against a compiled exclude matcher.
+    
+    Args:
+        path: Path to check (can be relative or absolute)
+        abs_repo_root: Resolved repository root path, resolved once by the caller
+        matcher: Matcher returned by _compile_excludes
         
-        # For patterns starting with **, also try without the ** prefix
-        # This handles cases like '**/vendor' matching 'vendor/file.js' at root
-        if pattern.startswith(_RECURSIVE_PREFIX):
-            stripped_pattern = pattern[len(_RECURSIVE_PREFIX):]
-            if _try_directory_patterns(rel_path, stripped_pattern):
-                return True
+    Returns:
+        True if path is excluded, False otherwise
+    """
+    rel_path = _relative_posix(path, abs_repo_root)
+    if rel_path is None:
+        # Path is not relative to repo_root, exclude it
+        logger.warning(f"Path {path} is not within repo root {abs_repo_root}")
+        return True
     
-    return False
+    return matcher(rel_path)
 
 
 def matches_exclude_pattern(path: Path, repo_root: Path, exclude_patterns: List[str]) -> bool:
@@ -160,32 +370,171 @@ def matches_exclude_pattern(path: Path, repo_root: Path, exclude_patterns: List[
     Returns:
         True if path matches any exclude pattern, False otherwise
     """
-    try:
-        # Resolve both paths to absolute to ensure relative_to works correctly
-        abs_path = path.resolve()
-        abs_repo_root = repo_root.resolve()
+    return _is_excluded(path, repo_root.resolve(), _compile_excludes(tuple(exclude_patterns)))
+
+
+def _path_sort_key(path: str) -> str:
+    """
+    Get a sort key for a path string that orders like the equivalent Path.
+    
+    Paths compare component by component, which is the same as comparing
+    strings once each separator is replaced by a character that sorts before
+    anything allowed in a file name.
+    """
+    return os.path.normcase(path).replace(os.sep, '\0')
+
+
+def _sorted_paths(paths: List[str]) -> List[Path]:
+    """Sort path strings in Path order and wrap them in Path objects."""
+    paths.sort(key=_path_sort_key)
+    return [Path(path) for path in paths]
+
+
+def _list_dir(
+    dirpath: str,
+    dir_fd: Optional[int] = None,
+) -> Optional[Tuple[List[os.DirEntry], List[os.DirEntry]]]:
+    """
+    List a directory with os.scandir, splitting entries into directories and files.
+    
+    Entries that are directories (including symlinks to directories) are listed
+    as subdirectories, everything else as files. When listing through a
+    descriptor, the entries' path attribute is only their name.
+    
+    Args:
+        dirpath: Directory to list
+        dir_fd: Optional open descriptor of the directory to list instead of dirpath
         
-        # Get path relative to repo root for matching
-        rel_path = abs_path.relative_to(abs_repo_root)
+    Returns:
+        Tuple of (subdirectory entries, file entries), or None if the directory
+        cannot be listed
+    """
+    subdirs = []
+    files = []
+    try:
+        with os.scandir(dirpath if dir_fd is None else dir_fd) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (subdirs if is_dir else files).append(entry)
+    except OSError as e:
+        logger.debug(f"Could not list directory {dirpath}: {e}")
+        return None
+    return subdirs, files
+
+
+# Directory path, relative directory path, subdirectory entries, file entries
+# and (if open) a descriptor of the directory, as yielded by the walkers
+_WalkItem = Tuple[str, str, List[os.DirEntry], List[os.DirEntry], Optional[int]]
+
+# Whether directories can be listed through a descriptor that files are then
+# opened relative to
+_LIST_BY_FD = os.scandir in os.supports_fd and os.open in os.supports_dir_fd
+
+
+def _walk(top: str, top_rel: str) -> Iterator[_WalkItem]:
+    """
+    Walk a directory tree top-down with os.scandir, without following symlinks.
+    
+    Like os.walk, but yields the DirEntry objects themselves so callers can use
+    their cached type information (from readdir) instead of stat-ing each path.
+    Callers may remove entries from the subdirectory list in place to prune the
+    walk; the remaining ones are visited in list order. Directories that cannot
+    be listed are skipped, as os.walk does.
+    
+    Each directory's path relative to the repository root is derived from its
+    parent's by appending the entry name, which is exact because symlinked
+    directories are never entered.
+    
+    Where supported, each directory is opened once and listed through its
+    descriptor, which stays open while the caller processes the directory so
+    files can be opened relative to it. Entry paths are then only names, so
+    callers should join them onto the directory path themselves.
+    
+    Args:
+        top: Directory to start from
+        top_rel: Path of top relative to the repository root, '/'-separated
         
-        # Check each pattern
-        for pattern in exclude_patterns:
-            # Try glob pattern matching
-            if _matches_glob_pattern(rel_path, pattern):
-                return True
+    Yields:
+        Tuples of (directory path, relative directory path, subdirectory
+        entries, file entries, directory descriptor or None)
+    """
+    stack = [(top, top_rel)]
+    while stack:
+        dirpath, rel_dir = stack.pop()
+        dir_fd = None
+        if _LIST_BY_FD:
+            try:
+                dir_fd = os.open(dirpath, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+            except OSError as e:
+                logger.debug(f"Could not list directory {dirpath}: {e}")
+                continue
+        try:
+            listing = _list_dir(dirpath, dir_fd)
+            if listing is None:
+                continue
+            subdirs, files = listing
             
-            # Also check if pattern is a simple directory name that appears in the path
-            # This ensures backward compatibility with simple patterns like 'node_modules'
-            # which should match any occurrence of that directory in the path
-            if pattern in rel_path.parts:
-                return True
-                
-    except ValueError:
-        # Path is not relative to repo_root, exclude it
-        logger.warning(f"Path {path} is not within repo root {repo_root}")
-        return True
+            yield dirpath, rel_dir, subdirs, files, dir_fd
+            
+            # Pick the subdirectories to descend into while the descriptor is
+            # still open: is_symlink() may need to stat relative to it
+            child_names = [entry.name for entry in subdirs if not entry.is_symlink()]
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+        
+        # Push in reverse so subdirectories are visited in list order
+        path_prefix = os.path.join(dirpath, '')
+        for name in reversed(child_names):
+            stack.append((path_prefix + name, _join_rel(rel_dir, name)))
+
+
+def _walk_parallel(
+    top: str,
+    top_rel: str,
+    max_workers: int,
+) -> Iterator[_WalkItem]:
+    """
+    Walk a directory tree like _walk, listing directories in a thread pool.
     
-    return False
+    Directory listings are dominated by syscall latency, during which the GIL
+    is released, so listing several directories at once overlaps that latency.
+    Subdirectories left in the list after the caller has processed a directory
+    are submitted as soon as control returns to the walk. Directories are
+    yielded in completion order rather than depth-first order; symlinked
+    directories are never entered, so no directory is listed twice.
+    Directories are listed by path, since completed listings can queue up
+    faster than they are processed and would each hold a descriptor open.
+    
+    Args:
+        top: Directory to start from
+        top_rel: Path of top relative to the repository root, '/'-separated
+        max_workers: Number of threads listing directories
+        
+    Yields:
+        Tuples of (directory path, relative directory path, subdirectory
+        entries, file entries, None)
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_list_dir, top): (top, top_rel)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                dirpath, rel_dir = pending.pop(future)
+                listing = future.result()
+                if listing is None:
+                    continue
+                subdirs, files = listing
+                
+                yield dirpath, rel_dir, subdirs, files, None
+                
+                for entry in subdirs:
+                    if not entry.is_symlink():
+                        child = (entry.path, _join_rel(rel_dir, entry.name))
+                        pending[executor.submit(_list_dir, entry.path)] = child
 
 
 def scan_repository(
@@ -193,6 +542,8 @@ def scan_repository(
     include_extensions: List[str],
     exclude_patterns: List[str],
     repo_root: Path,
+    jobs: int = 1,
+    trust_extensions: bool = False,
 ) -> ScanResult:
     """
     Scan repository directory tree for eligible source files.
@@ -206,6 +557,9 @@ def scan_repository(
         include_extensions: List of file extensions to include (e.g., ['.py', '.js'])
         exclude_patterns: List of path patterns to exclude (in addition to defaults)
         repo_root: Repository root path
+        jobs: Number of threads used to list directories (default: 1)
+        trust_extensions: If True, skip binary detection for files with
+            well-known text extensions (default: False)
         
     Returns:
         ScanResult object with categorized files
@@ -216,115 +570,133 @@ def scan_repository(
         - Binary files are detected and skipped
         - Permission errors are logged but don't abort the scan
     """
+    # Paths are collected as strings during the walk and converted at the end
     result = ScanResult()
     
     # Combine default excludes with user patterns
     all_exclude_patterns = DEFAULT_EXCLUDE_DIRS + exclude_patterns
     
+    # Compile patterns and resolve the repository root once for the whole scan
+    exclude_matcher = _compile_excludes(tuple(all_exclude_patterns))
+    entry_excluded = _compile_entry_excludes(tuple(all_exclude_patterns))
+    abs_repo_root = repo_root.resolve()
+    
+    # Normalize extensions once for case-insensitive comparison
+    normalized_extensions = frozenset(ext.lower() for ext in include_extensions)
+    trusted_extensions = _KNOWN_TEXT_EXTENSIONS if trust_extensions else frozenset()
+    
     logger.info(f"Scanning repository at {root_path}")
     logger.info(f"Include extensions: {include_extensions}")
     logger.info(f"Exclude patterns: {all_exclude_patterns}")
     
-    # Use os.walk for iterative directory traversal
-    # This handles deep directory trees without recursion limits
+    # Bind each category's append once, since every file ends up in one of them
+    add_eligible = result.eligible_files.append
+    add_binary = result.skipped_binary.append
+    add_excluded = result.skipped_excluded.append
+    add_symlink = result.skipped_symlink.append
+    add_permission = result.skipped_permission.append
+    add_extension = result.skipped_extension.append
+    
+    # Only the scan root needs resolving; every directory below it is checked
+    # (and pruned) by its relative path before the walk descends into it
+    root_rel = _relative_posix(root_path, abs_repo_root)
+    if root_rel is None:
+        # Root is not relative to repo_root, exclude it
+        logger.warning(f"Path {root_path} is not within repo root {abs_repo_root}")
+        walk = iter(())
+    elif exclude_matcher(root_rel):
+        logger.debug(f"Skipping excluded directory: {root_path}")
+        walk = iter(())
+    elif jobs > 1:
+        walk = _walk_parallel(os.fspath(root_path), root_rel, jobs)
+    else:
+        walk = _walk(os.fspath(root_path), root_rel)
+    
+    # Walk with os.scandir so file types come from the directory listing,
+    # iteratively to handle deep directory trees without recursion limits
     try:
-        for dirpath_str, dirnames, filenames in os.walk(root_path, topdown=True, followlinks=False):
-            dirpath = Path(dirpath_str)
-            
-            # Skip if this directory matches exclude patterns
-            if matches_exclude_pattern(dirpath, repo_root, all_exclude_patterns):
-                logger.debug(f"Skipping excluded directory: {dirpath}")
-                # Clear dirnames to prevent os.walk from descending
-                dirnames.clear()
-                continue
+        for dirpath, rel_dir, subdirs, files, dir_fd in walk:
+            # Entries' paths are this directory's plus their name
+            path_prefix = os.path.join(dirpath, '')
+            rel_prefix = _join_rel(rel_dir, '')
             
-            # Filter out excluded subdirectories from dirnames
-            # Modifying dirnames in-place affects which directories os.walk descends into
-            dirs_to_remove = []
-            for dirname in dirnames:
-                subdir = dirpath / dirname
-                
+            # Filter out excluded subdirectories
+            # Modifying subdirs in-place affects which directories the walk descends into
+            kept_dirs = []
+            for entry in subdirs:
                 # Check if it's a symlink
-                if subdir.is_symlink():
-                    logger.debug(f"Skipping symlink directory: {subdir}")
-                    dirs_to_remove.append(dirname)
+                if entry.is_symlink():
+                    logger.debug(f"Skipping symlink directory: {path_prefix + entry.name}")
                     continue
                 
                 # Check if it matches exclude patterns
-                if matches_exclude_pattern(subdir, repo_root, all_exclude_patterns):
-                    logger.debug(f"Skipping excluded directory: {subdir}")
-                    dirs_to_remove.append(dirname)
+                if entry_excluded(rel_prefix + entry.name, entry.name):
+                    logger.debug(f"Skipping excluded directory: {path_prefix + entry.name}")
                     continue
+                
+                kept_dirs.append(entry)
             
-            # Remove excluded directories
-            for dirname in dirs_to_remove:
-                dirnames.remove(dirname)
-            
-            # Sort dirnames for deterministic traversal order
-            dirnames.sort()
+            subdirs[:] = kept_dirs
             
             # Process files in this directory
-            for filename in sorted(filenames):  # Sort for deterministic order
-                filepath = dirpath / filename
+            for entry in files:
+                filepath = path_prefix + entry.name
                 
                 try:
                     # Skip symlinks
-                    if filepath.is_symlink():
+                    if entry.is_symlink():
                         logger.debug(f"Skipping symlink file: {filepath}")
-                        result.skipped_symlink.append(filepath)
+                        add_symlink(filepath)
                         continue
                     
                     # Check if it's a regular file
-                    if not filepath.is_file():
+                    if not entry.is_file(follow_symlinks=False):
                         logger.debug(f"Skipping non-file: {filepath}")
                         continue
                     
                     # Check if file matches exclude patterns
-                    if matches_exclude_pattern(filepath, repo_root, all_exclude_patterns):
+                    if entry_excluded(rel_prefix + entry.name, entry.name):
                         logger.debug(f"Skipping excluded file: {filepath}")
-                        result.skipped_excluded.append(filepath)
+                        add_excluded(filepath)
                         continue
                     
-                    # Check file extension
-                    file_ext = filepath.suffix.lower()  # Case-insensitive comparison
-                    
-                    # Normalize extensions in include_extensions for case-insensitive comparison
-                    normalized_extensions = [ext.lower() for ext in include_extensions]
-                    
+                    # Check file extension (case-insensitive comparison), taking
+                    # the suffix as PurePath.suffix does and lowercasing only it
+                    name = entry.name
+                    dot = name.rfind('.')
+                    file_ext = name[dot:].lower() if 0 < dot < len(name) - 1 else ''
                     if file_ext not in normalized_extensions:
                         logger.debug(f"Skipping file with non-matching extension: {filepath}")
-                        result.skipped_extension.append(filepath)
+                        add_extension(filepath)
                         continue
                     
-                    # Check if file is binary
-                    if is_binary_file(filepath):
+                    # Check if file is binary, unless its extension is trusted
+                    if file_ext not in trusted_extensions and is_binary_file(filepath, dir_fd):
                         logger.debug(f"Skipping binary file: {filepath}")
-                        result.skipped_binary.append(filepath)
+                        add_binary(filepath)
                         continue
                     
                     # File passed all filters - it's eligible
                     logger.debug(f"Eligible file: {filepath}")
-                    result.eligible_files.append(filepath)
+                    add_eligible(filepath)
                     
                 except PermissionError as e:
                     logger.warning(f"Permission denied reading {filepath}: {e}")
-                    result.skipped_permission.append(filepath)
+                    add_permission(filepath)
                 except (OSError, IOError) as e:
                     logger.warning(f"Error accessing {filepath}: {e}")
-                    result.skipped_permission.append(filepath)
+                    add_permission(filepath)
     
     except PermissionError as e:
         logger.error(f"Permission denied accessing directory {root_path}: {e}")
     except Exception as e:
         logger.error(f"Error scanning directory {root_path}: {e}", exc_info=True)
     
-    # Sort all results for deterministic output
-    result.eligible_files.sort()
-    result.skipped_binary.sort()
-    result.skipped_excluded.sort()
-    result.skipped_symlink.sort()
-    result.skipped_permission.sort()
-    result.skipped_extension.sort()
+    # Sort all results for deterministic output (whatever order directories
+    # and entries were visited in), wrapping the path strings collected during
+    # the walk in Path objects only once at the end
+    for result_field in fields(result):
+        setattr(result, result_field.name, _sorted_paths(getattr(result, result_field.name)))
     
     logger.info(f"Scan complete: {len(result.eligible_files)} eligible files, "
                 f"{len(result.skipped_binary)} binary, "
@@ -5,9 +5,12 @@ Provides helper functions for BOM detection, shebang handling, and file encoding
 """
 
 import codecs
+import errno
 import logging
+import os
+import shutil
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -38,36 +41,172 @@ BOM_TO_WRITE_ENCODING = {
     BOM_UTF16_BE: 'utf-16-be',
 }
 
+# BOM lookup tables keyed on the file prefix read as a little-endian integer.
+# UTF-32 needs the full 4 bytes, UTF-8 the low 24 bits and UTF-16 the low 16 bits.
+# Checking the widest table first keeps UTF-32 LE (FF FE 00 00) from being
+# misdetected as UTF-16 LE (FF FE).
+_BOM_BY_U32 = {
+    int.from_bytes(bom, 'little'): (bom, BOM_TO_ENCODING[bom])
+    for bom in (BOM_UTF32_LE, BOM_UTF32_BE)
+}
+_BOM_BY_U24 = {
+    int.from_bytes(BOM_UTF8, 'little'): (BOM_UTF8, BOM_TO_ENCODING[BOM_UTF8]),
+}
+_BOM_BY_U16 = {
+    int.from_bytes(bom, 'little'): (bom, BOM_TO_ENCODING[bom])
+    for bom in (BOM_UTF16_LE, BOM_UTF16_BE)
+}
+
+
+# Number of leading bytes checked for NUL bytes when reading a file as UTF-8
+_BINARY_CHECK_SIZE = 8192
+
+# Chunk size used when copying file contents
+_COPY_CHUNK_SIZE = 1 << 20
+
+
+class BinaryFileError(ValueError):
+    """Raised when a file expected to be UTF-8 text contains NUL bytes."""
+
+
+# Cache of BOM detection results, keyed by path string.
+# Each entry stores (st_mtime_ns, st_size, (BOM bytes or None, encoding)) so that a
+# stale entry is ignored as soon as the file changes on disk.
+_BOM_CACHE_MAX_ENTRIES = 4096
+_bom_cache: Dict[str, Tuple[int, int, Tuple[Optional[bytes], str]]] = {}
+
+
+def _match_bom(start: bytes) -> Tuple[Optional[bytes], str]:
+    """
+    Identify the BOM at the start of a file from its first (up to) 4 bytes.
+    
+    Args:
+        start: Leading bytes of the file
+        
+    Returns:
+        Tuple of (BOM bytes or None, encoding name)
+    """
+    prefix = int.from_bytes(start, 'little')
+    length = len(start)
+    
+    match = None
+    if length >= 4:
+        match = _BOM_BY_U32.get(prefix)
+    if match is None and length >= 3:
+        match = _BOM_BY_U24.get(prefix & 0xFFFFFF)
+    if match is None and length >= 2:
+        match = _BOM_BY_U16.get(prefix & 0xFFFF)
+    
+    if match is None:
+        return None, 'utf-8'
+    return match
+
+
+def forget_bom(file_path: Path) -> None:
+    """
+    Drop any cached BOM detection result for a file.
+    
+    Call this after replacing a file by a path the cache cannot see through,
+    such as renaming a temporary file over it.
+    
+    Args:
+        file_path: Path to the file that changed
+    """
+    _bom_cache.pop(os.fspath(file_path), None)
+
+
+def _remember_bom(key: str, stat_info: os.stat_result, result: Tuple[Optional[bytes], str]) -> None:
+    """Cache a BOM detection result for a file path under its (mtime, size)."""
+    if len(_bom_cache) >= _BOM_CACHE_MAX_ENTRIES:
+        # Evict the oldest entry (dicts preserve insertion order)
+        del _bom_cache[next(iter(_bom_cache))]
+    _bom_cache[key] = (stat_info.st_mtime_ns, stat_info.st_size, result)
+
 
-def detect_bom(file_path: Path) -> Tuple[Optional[bytes], str]:
+def detect_bom(
+    file_path: Path,
+    stat_info: Optional[os.stat_result] = None
+) -> Tuple[Optional[bytes], str]:
     """
     Detect BOM (Byte Order Mark) in a file.
     
+    Results are cached by (mtime, size), so repeated detection on an unchanged
+    file (e.g. binary detection followed by reading) costs a single stat.
+    Symlinks are followed, so the key describes the file whose bytes were read.
+    
     Args:
         file_path: Path to the file to check
+        stat_info: Stat result the caller already has for the file (following
+            symlinks), to skip the stat
         
     Returns:
         Tuple of (BOM bytes or None, encoding name)
         If no BOM found, returns (None, 'utf-8')
     """
+    key = os.fspath(file_path)
     try:
-        with open(file_path, 'rb') as f:
-            # Read first few bytes to check for BOM
-            start = f.read(4)
-            
-            # Check for BOMs (order matters - check longer ones first)
-            for bom, encoding in BOM_TO_ENCODING.items():
-                if start.startswith(bom):
-                    logger.debug(f"Detected BOM {encoding} in {file_path}")
-                    return bom, encoding
-            
-            # No BOM found
-            return None, 'utf-8'
+        if stat_info is None:
+            stat_info = os.stat(key)
+        cached = _bom_cache.get(key)
+        if cached is not None and cached[0] == stat_info.st_mtime_ns and cached[1] == stat_info.st_size:
+            return cached[2]
+        
+        # Read first few bytes to check for BOM, keying the result on the
+        # opened file itself
+        fd = os.open(key, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            start = os.read(fd, 4)
+            stat_info = os.fstat(fd)
+        finally:
+            os.close(fd)
+        
+        result = _match_bom(start)
+        if result[0] is not None:
+            logger.debug(f"Detected BOM {result[1]} in {file_path}")
+        
+        _remember_bom(key, stat_info, result)
+        return result
     except (OSError, IOError) as e:
         logger.warning(f"Error detecting BOM in {file_path}: {e}")
         return None, 'utf-8'
 
 
+def sniff_prefix(
+    file_path: Path,
+    dir_fd: Optional[int] = None
+) -> Tuple[Tuple[Optional[bytes], str], bool]:
+    """
+    Detect the BOM of a file and whether it looks binary from one read.
+    
+    Only the first chunk of the file is read. A file is binary if it has no
+    BOM and that chunk contains a NUL byte. The BOM is cached for later reads
+    of the same file.
+    
+    Args:
+        file_path: Path to the file to check
+        dir_fd: Optional descriptor of the file's directory; if given, the file
+            is opened by name relative to it instead of by its full path
+        
+    Returns:
+        Tuple of ((BOM bytes or None, encoding name), True if binary)
+        
+    Raises:
+        OSError: If the file cannot be opened or read
+    """
+    key = os.fspath(file_path)
+    open_path = key if dir_fd is None else os.path.basename(key)
+    fd = os.open(open_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0), dir_fd=dir_fd)
+    try:
+        chunk = os.read(fd, _BINARY_CHECK_SIZE)
+        stat_info = os.fstat(fd)
+    finally:
+        os.close(fd)
+    
+    bom_info = _match_bom(chunk[:4])
+    _remember_bom(key, stat_info, bom_info)
+    return bom_info, bom_info[0] is None and b'\x00' in chunk
+
+
 def has_shebang(content: str) -> bool:
     """
     Check if content starts with a shebang line.
@@ -81,6 +220,30 @@ def has_shebang(content: str) -> bool:
     return content.startswith('#!')
 
 
+def shebang_end(content: str) -> int:
+    """
+    Find where the shebang line ends without copying the content.
+    
+    Only the first line is scanned.
+    
+    Args:
+        content: File content as string
+        
+    Returns:
+        Offset just past the shebang line (including its newline if present),
+        or 0 if content has no shebang
+    """
+    if not content.startswith('#!'):
+        return 0
+    
+    # Find the end of the first line
+    newline_idx = content.find('\n', 2)
+    if newline_idx == -1:
+        # File is just a shebang with no newline
+        return len(content)
+    return newline_idx + 1
+
+
 def extract_shebang(content: str) -> Tuple[Optional[str], str]:
     """
     Extract shebang line from content if present.
@@ -92,73 +255,276 @@ def extract_shebang(content: str) -> Tuple[Optional[str], str]:
         Tuple of (shebang line or None, remaining content)
         Shebang line includes the newline character if present.
     """
-    if not has_shebang(content):
+    end = shebang_end(content)
+    if end == 0:
         return None, content
     
-    # Find the end of the first line
-    newline_idx = content.find('\n')
-    if newline_idx == -1:
-        # File is just a shebang with no newline
-        return content, ''
-    
     # Include the newline in the shebang
-    shebang = content[:newline_idx + 1]
-    remaining = content[newline_idx + 1:]
+    return content[:end], content[end:]
+
+
+def _read_all_bytes(path: str, limit: Optional[int] = None) -> bytes:
+    """
+    Read a file's raw bytes with plain os-level calls.
+    
+    The size from fstat is used to read the whole file in one go; short reads
+    (e.g. a file that grew meanwhile, or one that reports no size) fall back to
+    reading until EOF.
     
-    return shebang, remaining
+    Args:
+        path: Path of the file to read, as a string
+        limit: Maximum number of bytes to read (the whole file if None)
+        
+    Returns:
+        File content as bytes
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        size = os.fstat(fd).st_size
+        if limit is not None:
+            size = min(size, limit)
+        data = os.read(fd, size) if size else b''
+        if size and len(data) == size:
+            return data
+        
+        # Nothing reported by fstat, or a short read: read until EOF (or the limit)
+        chunks = [data]
+        remaining = None if limit is None else limit - len(data)
+        while remaining is None or remaining > 0:
+            chunk = os.read(fd, _COPY_CHUNK_SIZE if remaining is None else min(remaining, _COPY_CHUNK_SIZE))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+        return b''.join(chunks)
+    finally:
+        os.close(fd)
 
 
-def read_file_with_encoding(file_path: Path) -> Tuple[str, Optional[bytes], str]:
+def read_file_with_encoding(
+    file_path: Path,
+    bom_info: Optional[Tuple[Optional[bytes], str]] = None,
+    errors: str = 'strict'
+) -> Tuple[str, Optional[bytes], str]:
     """
     Read file content while preserving BOM information.
     
     Args:
         file_path: Path to file to read
+        bom_info: Previously detected (BOM bytes or None, encoding) for this file,
+            to skip detection
+        errors: Decoding error handler. 'surrogateescape' decodes undecodable
+            bytes in the same pass, and write_file_with_encoding with the same
+            handler restores them byte for byte.
         
     Returns:
         Tuple of (content, BOM bytes or None, encoding)
+        
+    Raises:
+        BinaryFileError: If a UTF-8 file has NUL bytes near its start
     """
-    bom, encoding = detect_bom(file_path)
+    if bom_info is None:
+        bom_info = detect_bom(file_path)
+    bom, encoding = bom_info
     
     try:
-        # Read with newline=None to get universal newlines but preserve original style
-        with open(file_path, 'r', encoding=encoding, newline='') as f:
-            content = f.read()
+        data = _read_all_bytes(os.fspath(file_path))
+        
+        # NUL bytes are valid UTF-8 but mean the file is binary. UTF-16/32 text
+        # legitimately contains them, so only UTF-8 files are checked.
+        if bom is None or bom == BOM_UTF8:
+            if data.find(b'\x00', 0, _BINARY_CHECK_SIZE) != -1:
+                raise BinaryFileError(f"File appears to be binary: {file_path}")
+        
+        # Decoding the raw bytes preserves the original line endings
+        content = data.decode(encoding, errors)
         return content, bom, encoding
     except (OSError, IOError, UnicodeDecodeError) as e:
         logger.error(f"Error reading file {file_path}: {e}")
         raise
 
 
+def read_file_prefix_bytes(
+    file_path: Path,
+    size: int,
+    bom_info: Optional[Tuple[Optional[bytes], str]] = None
+) -> bytes:
+    """
+    Read the raw bytes at the start of a file, without decoding them.
+    
+    Args:
+        file_path: Path to file to read
+        size: Number of bytes to read after the BOM
+        bom_info: Previously detected (BOM bytes or None, encoding) for this file,
+            to skip detection
+        
+    Returns:
+        Raw prefix of the file, including the BOM if present
+        
+    Raises:
+        BinaryFileError: If a UTF-8 file has NUL bytes in the prefix
+    """
+    if bom_info is None:
+        bom_info = detect_bom(file_path)
+    bom = bom_info[0]
+    
+    try:
+        data = _read_all_bytes(os.fspath(file_path), len(bom or b'') + size)
+    except (OSError, IOError) as e:
+        logger.error(f"Error reading file {file_path}: {e}")
+        raise
+    
+    if (bom is None or bom == BOM_UTF8) and data.find(b'\x00', 0, _BINARY_CHECK_SIZE) != -1:
+        raise BinaryFileError(f"File appears to be binary: {file_path}")
+    return data
+
+
+def read_file_prefix(
+    file_path: Path,
+    size: int,
+    bom_info: Optional[Tuple[Optional[bytes], str]] = None
+) -> str:
+    """
+    Read and decode only the start of a file.
+    
+    A multi-byte character cut off at the end of the prefix is dropped rather
+    than treated as a decoding error, so the result is always a prefix of the
+    full decoded content.
+    
+    Args:
+        file_path: Path to file to read
+        size: Number of bytes to read after the BOM
+        bom_info: Previously detected (BOM bytes or None, encoding) for this file,
+            to skip detection
+        
+    Returns:
+        Decoded prefix of the file content (without BOM)
+        
+    Raises:
+        BinaryFileError: If a UTF-8 file has NUL bytes in the prefix
+    """
+    if bom_info is None:
+        bom_info = detect_bom(file_path)
+    data = read_file_prefix_bytes(file_path, size, bom_info)
+    
+    try:
+        return codecs.getincrementaldecoder(bom_info[1])().decode(data, final=False)
+    except UnicodeDecodeError as e:
+        logger.error(f"Error reading file {file_path}: {e}")
+        raise
+
+
+def _write_all(fd: int, chunks: List[bytes]) -> None:
+    """
+    Write a sequence of buffers to a file descriptor with as few syscalls as possible.
+    
+    Uses a single os.writev call where available (retrying on short writes),
+    so the buffers never need to be joined into one.
+    
+    Args:
+        fd: File descriptor open for writing
+        chunks: Buffers to write, in order
+    """
+    views = [memoryview(chunk) for chunk in chunks if chunk]
+    writev = getattr(os, 'writev', None)
+    if writev is None:
+        for view in views:
+            while view:
+                view = view[os.write(fd, view):]
+        return
+    
+    while views:
+        written = writev(fd, views)
+        # Drop the buffers that were written completely, then trim a partial one
+        while views and written >= len(views[0]):
+            written -= len(views.pop(0))
+        if written:
+            views[0] = views[0][written:]
+
+
 def write_file_with_encoding(
     file_path: Path,
     content: str,
     bom: Optional[bytes] = None,
-    encoding: str = 'utf-8'
+    encoding: str = 'utf-8',
+    errors: str = 'strict'
 ) -> None:
     """
     Write file content while preserving BOM if present.
     
+    Line endings in the content are written as-is.
+    
     Args:
         file_path: Path to file to write
         content: Content to write
         bom: BOM bytes to prepend (if any)
         encoding: Encoding to use
+        errors: Encoding error handler, matching the one used to read the content
+    """
+    forget_bom(file_path)
+    if bom is not None:
+        # Determine the write encoding based on the BOM (the BOM itself is written
+        # separately, so the encoding must not add another one)
+        encoding = BOM_TO_WRITE_ENCODING.get(bom, encoding.replace('-sig', ''))
+    
+    try:
+        data = content.encode(encoding, errors)
+        fd = os.open(
+            file_path,
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0),
+            0o666,
+        )
+        try:
+            # BOM and content go out together without concatenating them first
+            _write_all(fd, [bom or b'', data])
+        finally:
+            os.close(fd)
+    except (OSError, IOError) as e:
+        logger.error(f"Error writing file {file_path}: {e}")
+        raise
+
+
+def write_file_with_prefix(
+    file_path: Path,
+    prefix: bytes,
+    source_path: Path,
+    source_offset: int
+) -> None:
     """
+    Write prefix bytes followed by the tail of another file, unchanged.
+    
+    The tail is copied in the kernel with os.copy_file_range where available,
+    so it never passes through a Python buffer. Falls back to a buffered copy
+    on platforms or filesystems that don't support it.
+    
+    Args:
+        file_path: Path to file to write
+        prefix: Bytes to write before the copied tail
+        source_path: File to copy the tail from
+        source_offset: Byte offset in source_path where the tail starts
+    """
+    forget_bom(file_path)
     try:
-        # If we have a BOM, write it in binary mode first
-        if bom is not None:
-            # Determine the write encoding based on the BOM
-            write_encoding = BOM_TO_WRITE_ENCODING.get(bom, encoding.replace('-sig', ''))
-            with open(file_path, 'wb') as f:
-                f.write(bom)
-                # Use newline='' mode encoding to preserve line endings
-                # Encode the content with the proper encoding, preserving CRLF/LF
-                f.write(content.encode(write_encoding))
-        else:
-            # Use newline='' to preserve original line endings in the content
-            with open(file_path, 'w', encoding=encoding, newline='') as f:
-                f.write(content)
+        with open(source_path, 'rb', buffering=0) as src, open(file_path, 'wb') as dst:
+            dst.write(prefix)
+            dst.flush()
+            src.seek(source_offset)
+            
+            copy_file_range = getattr(os, 'copy_file_range', None)
+            if copy_file_range is not None:
+                copied_any = False
+                try:
+                    while copy_file_range(src.fileno(), dst.fileno(), _COPY_CHUNK_SIZE):
+                        copied_any = True
+                    return
+                except OSError as e:
+                    # Unsupported by this kernel/filesystem pair; fall back unless we
+                    # already copied part of the file
+                    if copied_any or e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                        raise
+            
+            shutil.copyfileobj(src, dst, _COPY_CHUNK_SIZE)
     except (OSError, IOError) as e:
         logger.error(f"Error writing file {file_path}: {e}")
         raise
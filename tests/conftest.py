@@ -0,0 +1,35 @@
+"""
+Shared pytest configuration for the license-header test suite.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+# RAM-backed filesystem used for temporary test directories on Linux
+_TMPFS_ROOT = '/dev/shm'
+
+
+def pytest_configure(config):
+    """
+    Put tmp_path directories on tmpfs when available.
+    
+    Most tests write and read back a handful of small files, so keeping them
+    in memory avoids disk writeback. A fresh directory is created per run and
+    passed to pytest as its base temporary directory; it is removed again in
+    pytest_unconfigure. An explicit --basetemp takes precedence, and xdist
+    workers inherit the controller's directory.
+    """
+    if config.option.basetemp or hasattr(config, 'workerinput'):
+        return
+    if sys.platform.startswith('linux') and os.path.isdir(_TMPFS_ROOT) and os.access(_TMPFS_ROOT, os.W_OK):
+        config.option.basetemp = tempfile.mkdtemp(prefix='license-header-pytest-', dir=_TMPFS_ROOT)
+        config._tmpfs_basetemp = config.option.basetemp
+
+
+def pytest_unconfigure(config):
+    """Remove the tmpfs base temporary directory created by pytest_configure."""
+    basetemp = getattr(config, '_tmpfs_basetemp', None)
+    if basetemp is not None:
+        shutil.rmtree(basetemp, ignore_errors=True)
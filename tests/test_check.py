@@ -6,8 +6,10 @@ import tempfile
 import pytest
 from pathlib import Path
 
+from license_header.apply import apply_header_to_file
 from license_header.check import check_file_header, check_headers, CheckResult
 from license_header.config import Config
+from license_header.utils import BinaryFileError
 
 
 class TestCheckResult:
@@ -112,6 +114,17 @@ class TestCheckFileHeader:
             with pytest.raises(OSError):
                 check_file_header(file_path, header)
 
+    def test_binary_file(self):
+        """Test checking a file with NUL bytes raises BinaryFileError."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            file_path = tmpdir_path / 'binary.py'
+            file_path.write_bytes(b'\x00\x01\x02\x03binary')
+            header = '# Copyright 2024\n'
+            
+            with pytest.raises(BinaryFileError):
+                check_file_header(file_path, header)
+
 
 class TestCheckHeaders:
     """Test check_headers function."""
@@ -235,3 +248,32 @@ class TestCheckHeaders:
             assert len(result.compliant_files) == 0
             assert len(result.non_compliant_files) == 0
             assert result.is_compliant() is True
+    
+    def test_apply_and_check_agree_on_undecodable_tail(self, tmp_path):
+        """Test that apply and check agree on a file whose content past the header is not UTF-8."""
+        header = '# Copyright 2024\n'
+        header_file = tmp_path / 'HEADER.txt'
+        header_file.write_text(header)
+        
+        # Invalid UTF-8 well past the bytes read to find the header
+        tail = b'x = 1\n' * 200 + b'# \xe9\n'
+        (tmp_path / 'with_header.py').write_bytes(header.encode() + tail)
+        (tmp_path / 'without_header.py').write_bytes(tail)
+        
+        # Apply reports the file with the header as compliant...
+        assert apply_header_to_file(tmp_path / 'with_header.py', header) is False
+        with pytest.raises(UnicodeDecodeError):
+            apply_header_to_file(tmp_path / 'without_header.py', header)
+        
+        # ...and so does check, right after
+        config = Config(header_file=str(header_file))
+        config._repo_root = tmp_path
+        config._header_content = header
+        config.path = '.'
+        config.include_extensions = ['.py']
+        config.exclude_paths = []
+        
+        result = check_headers(config)
+        
+        assert [f.name for f in result.compliant_files] == ['with_header.py']
+        assert [f.name for f in result.failed_files] == ['without_header.py']
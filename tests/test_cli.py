@@ -3,21 +3,43 @@ Tests for CLI module.
 """
 
 import json
-import os
-import tempfile
 import pytest
 from pathlib import Path
+from click import ClickException
 from click.testing import CliRunner
 
-from license_header.cli import main
+from license_header.cli import echo_config, main
+from license_header.config import get_header_content, merge_config
+
+# Config file payloads, serialized once
+_CONFIG_HEADER = json.dumps({'header_file': 'HEADER.txt'})
+_CONFIG_HEADER1 = json.dumps({'header_file': 'HEADER1.txt'})
+_CONFIG_PY_ONLY = json.dumps({'header_file': 'HEADER.txt', 'include_extensions': ['.py']})
+
+
+def _echo_merged_config(cli_args, repo_root, capsys):
+    """Merge CLI args as the commands do and return the displayed configuration."""
+    cfg = merge_config(cli_args, repo_root=repo_root)
+    echo_config(cfg, get_header_content(cfg))
+    return capsys.readouterr().out
+
+
+@pytest.fixture(scope="session")
+def help_results():
+    """Invoke each --help once per session and share the results."""
+    runner = CliRunner()
+    return {
+        'main': runner.invoke(main, ['--help']),
+        'apply': runner.invoke(main, ['apply', '--help']),
+        'check': runner.invoke(main, ['check', '--help']),
+    }
 
 
 class TestCLI:
     """Test CLI commands."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
+    # CliRunner holds no per-invocation state, so one instance serves the class
+    runner = CliRunner()
     
     def test_version(self):
         """Test --version flag."""
@@ -25,57 +47,38 @@ class TestCLI:
         assert result.exit_code == 0
         assert '0.2.0' in result.output
     
-    def test_help(self):
-        """Test --help flag."""
-        result = self.runner.invoke(main, ['--help'])
+    @pytest.mark.parametrize("command,needles", [
+        ('main', ['License Header CLI', 'apply', 'check']),
+        ('apply', ['--config', '--header', '--include-extension', '--exclude-path', '--dry-run']),
+        ('check', ['--config', '--header', '--dry-run', '--jobs']),
+    ])
+    def test_help(self, help_results, command, needles):
+        """Test --help output of the main group and each subcommand."""
+        result = help_results[command]
         assert result.exit_code == 0
-        assert 'License Header CLI' in result.output
-        assert 'apply' in result.output
-        assert 'check' in result.output
-    
-    def test_apply_help(self):
-        """Test apply --help."""
-        result = self.runner.invoke(main, ['apply', '--help'])
-        assert result.exit_code == 0
-        assert '--config' in result.output
-        assert '--header' in result.output
-        assert '--include-extension' in result.output
-        assert '--exclude-path' in result.output
-        assert '--dry-run' in result.output
-    
-    def test_check_help(self):
-        """Test check --help."""
-        result = self.runner.invoke(main, ['check', '--help'])
-        assert result.exit_code == 0
-        assert '--config' in result.output
-        assert '--header' in result.output
-        assert '--dry-run' in result.output
+        for needle in needles:
+            assert needle in result.output
 
 
 class TestApplyCommand:
     """Test apply command."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
+    runner = CliRunner()
     
-    def test_apply_with_header_file(self):
-        """Test apply command with header file."""
-        with self.runner.isolated_filesystem():
-            # Create header file
-            Path('HEADER.txt').write_text('# Copyright\n')
-            
-            result = self.runner.invoke(main, ['apply', '--header', 'HEADER.txt', '--dry-run'])
-            assert result.exit_code == 0
-            assert 'Configuration loaded successfully' in result.output
-            assert 'Header file: HEADER.txt' in result.output
+    def test_apply_with_header_file(self, tmp_path, capsys):
+        """Test apply configuration display with header file."""
+        # Create header file
+        (tmp_path / 'HEADER.txt').write_text('# Copyright\n')
+        
+        output = _echo_merged_config({'header': 'HEADER.txt', 'dry_run': True}, tmp_path, capsys)
+        assert 'Configuration loaded successfully' in output
+        assert 'Header file: HEADER.txt' in output
     
-    def test_apply_missing_header_file(self):
+    def test_apply_missing_header_file(self, tmp_path, monkeypatch):
         """Test apply command with missing header file."""
-        with self.runner.isolated_filesystem():
-            result = self.runner.invoke(main, ['apply', '--header', 'nonexistent.txt'])
-            assert result.exit_code != 0
-            assert 'Header file not found' in result.output
+        monkeypatch.chdir(tmp_path)
+        with pytest.raises(ClickException, match='Header file not found'):
+            main.main(['apply', '--header', 'nonexistent.txt'], standalone_mode=False)
     
     def test_apply_with_config_file(self):
         """Test apply command with config file."""
@@ -84,11 +87,7 @@ class TestApplyCommand:
             Path('HEADER.txt').write_text('# Copyright\n')
             
             # Create config file
-            config_data = {
-                'header_file': 'HEADER.txt',
-                'include_extensions': ['.py'],
-            }
-            Path('config.json').write_text(json.dumps(config_data))
+            Path('config.json').write_text(_CONFIG_PY_ONLY)
             
             result = self.runner.invoke(main, ['apply', '--config', 'config.json', '--dry-run'])
             assert result.exit_code == 0
@@ -103,10 +102,7 @@ class TestApplyCommand:
             Path('HEADER2.txt').write_text('# Header 2\n')
             
             # Create config file
-            config_data = {
-                'header_file': 'HEADER1.txt',
-            }
-            Path('config.json').write_text(json.dumps(config_data))
+            Path('config.json').write_text(_CONFIG_HEADER1)
             
             result = self.runner.invoke(main, [
                 'apply',
@@ -124,44 +120,33 @@ class TestApplyCommand:
             Path('HEADER.txt').write_text('# Copyright\n')
             
             # Create default config file
-            config_data = {
-                'header_file': 'HEADER.txt',
-            }
-            Path('license-header.config.json').write_text(json.dumps(config_data))
+            Path('license-header.config.json').write_text(_CONFIG_HEADER)
             
             result = self.runner.invoke(main, ['apply', '--dry-run'])
             assert result.exit_code == 0
             assert 'Configuration loaded successfully' in result.output
     
-    def test_apply_with_extensions(self):
-        """Test apply command with custom extensions."""
-        with self.runner.isolated_filesystem():
-            Path('HEADER.txt').write_text('# Copyright\n')
-            
-            result = self.runner.invoke(main, [
-                'apply',
-                '--header', 'HEADER.txt',
-                '--include-extension', '.py',
-                '--include-extension', '.js',
-                '--dry-run'
-            ])
-            assert result.exit_code == 0
-            assert 'Include extensions: .py, .js' in result.output
-    
-    def test_apply_with_exclude_paths(self):
-        """Test apply command with exclude paths."""
-        with self.runner.isolated_filesystem():
-            Path('HEADER.txt').write_text('# Copyright\n')
-            
-            result = self.runner.invoke(main, [
-                'apply',
-                '--header', 'HEADER.txt',
-                '--exclude-path', 'dist',
-                '--exclude-path', 'build',
-                '--dry-run'
-            ])
-            assert result.exit_code == 0
-            assert 'Exclude paths: dist, build' in result.output
+    def test_apply_with_extensions(self, tmp_path, capsys):
+        """Test apply configuration display with custom extensions."""
+        (tmp_path / 'HEADER.txt').write_text('# Copyright\n')
+        
+        output = _echo_merged_config({
+            'header': 'HEADER.txt',
+            'include_extension': ['.py', '.js'],
+            'dry_run': True,
+        }, tmp_path, capsys)
+        assert 'Include extensions: .py, .js' in output
+    
+    def test_apply_with_exclude_paths(self, tmp_path, capsys):
+        """Test apply configuration display with exclude paths."""
+        (tmp_path / 'HEADER.txt').write_text('# Copyright\n')
+        
+        output = _echo_merged_config({
+            'header': 'HEADER.txt',
+            'exclude_path': ['dist', 'build'],
+            'dry_run': True,
+        }, tmp_path, capsys)
+        assert 'Exclude paths: dist, build' in output
     
     def test_apply_with_default_license_header(self):
         """Test apply command with default LICENSE_HEADER file."""
@@ -183,42 +168,35 @@ class TestApplyCommand:
             assert result.exit_code == 0
             assert 'Header file: CUSTOM.txt' in result.output
     
-    def test_apply_with_absolute_header_path(self):
+    def test_apply_with_absolute_header_path(self, tmp_path_factory):
         """Test apply command with absolute path to header file."""
+        # Create a header file outside the working directory
+        abs_header_path = str(tmp_path_factory.mktemp("abs_hdr") / "hdr.txt")
+        Path(abs_header_path).write_text('# Absolute Path Header\n')
+        
         with self.runner.isolated_filesystem():
-            # Create a header file with absolute path
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-                f.write('# Absolute Path Header\n')
-                abs_header_path = f.name
-            
-            try:
-                result = self.runner.invoke(main, ['apply', '--header', abs_header_path, '--dry-run'])
-                assert result.exit_code == 0
-                assert 'Configuration loaded successfully' in result.output
-                assert abs_header_path in result.output
-            finally:
-                # Clean up
-                os.unlink(abs_header_path)
+            result = self.runner.invoke(main, ['apply', '--header', abs_header_path, '--dry-run'])
+            assert result.exit_code == 0
+            assert 'Configuration loaded successfully' in result.output
+            assert abs_header_path in result.output
     
-    def test_apply_with_config_path_outside_repo_rejected(self):
+    def test_apply_with_config_path_outside_repo_rejected(self, tmp_path, monkeypatch):
         """Test that config paths escaping repo are rejected."""
-        with self.runner.isolated_filesystem():
-            # Create header file
-            Path('HEADER.txt').write_text('# Copyright\n')
-            
-            # Try to use a config path that escapes the repo
-            result = self.runner.invoke(main, ['apply', '--config', '../outside_config.json', '--dry-run'])
-            assert result.exit_code != 0
-            assert 'Configuration file path' in result.output
-            assert 'traverses above repository root' in result.output
+        monkeypatch.chdir(tmp_path)
+        # Create header file
+        Path('HEADER.txt').write_text('# Copyright\n')
+        
+        # Try to use a config path that escapes the repo
+        with pytest.raises(ClickException) as exc_info:
+            main.main(['apply', '--config', '../outside_config.json', '--dry-run'], standalone_mode=False)
+        assert 'Configuration file path' in str(exc_info.value)
+        assert 'traverses above repository root' in str(exc_info.value)
 
 
 class TestCheckCommand:
     """Test check command."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
+    runner = CliRunner()
     
     def test_check_with_header_file(self):
         """Test check command with header file."""
@@ -248,9 +226,8 @@ class TestCheckCommand:
             assert 'Dry run: True' in result.output
             assert 'Summary:' in result.output
     
-    def test_check_missing_header_file(self):
+    def test_check_missing_header_file(self, tmp_path, monkeypatch):
         """Test check command with missing header file."""
-        with self.runner.isolated_filesystem():
-            result = self.runner.invoke(main, ['check', '--header', 'nonexistent.txt'])
-            assert result.exit_code != 0
-            assert 'Header file not found' in result.output
+        monkeypatch.chdir(tmp_path)
+        with pytest.raises(ClickException, match='Header file not found'):
+            main.main(['check', '--header', 'nonexistent.txt'], standalone_mode=False)
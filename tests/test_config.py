@@ -3,6 +3,7 @@ Tests for configuration module.
 """
 
 import json
+import os
 import pytest
 from pathlib import Path
 from click import ClickException
@@ -17,6 +18,32 @@ from license_header.config import (
     get_header_content,
 )
 
+# Config file payloads, serialized once
+_CONFIG_HEADER = json.dumps({"header_file": "HEADER.txt"})
+_CONFIG_CUSTOM = json.dumps({"header_file": "CUSTOM.txt"})
+_CONFIG_JOBS = json.dumps({"header_file": "HEADER.txt", "jobs": 4})
+_CONFIG_TRUST = json.dumps({"header_file": "HEADER.txt", "trust_extensions": True})
+_CONFIG_PY_JS = json.dumps({"header_file": "HEADER.txt", "include_extensions": [".py", ".js"]})
+_CONFIG_PY_DIST = json.dumps({"header_file": "HEADER.txt", "include_extensions": [".py"], "exclude_paths": ["dist"]})
+_CONFIG_HEADER1_PY = json.dumps({"header_file": "HEADER1.txt", "include_extensions": [".py"]})
+_CONFIG_EXT_PY = json.dumps({"include_extensions": [".py"]})
+_CONFIG_EXT_PY_TS = json.dumps({"include_extensions": [".py", ".ts"]})
+
+
+def _make_header(directory, content, name="HEADER.txt"):
+    """Write a header file with a single write and return its path."""
+    header_file = directory / name
+    header_file.write_bytes(content.encode('utf-8'))
+    return header_file
+
+
+@pytest.fixture(scope="module")
+def base_repo(tmp_path_factory):
+    """Repository root containing HEADER.txt, shared by tests that don't modify it."""
+    root = tmp_path_factory.mktemp("repo")
+    _make_header(root, "# Header\n")
+    return root
+
 
 class TestConfig:
     """Test Config dataclass."""
@@ -29,6 +56,7 @@ class TestConfig:
         assert 'node_modules' in config.exclude_paths
         assert config.dry_run is False
         assert config.mode == 'apply'
+        assert config.jobs == 1
         
 
 class TestFindRepoRoot:
@@ -56,16 +84,24 @@ class TestLoadConfigFile:
     def test_load_valid_config(self, tmp_path):
         """Test loading a valid config file."""
         config_file = tmp_path / "config.json"
-        config_data = {
-            "header_file": "HEADER.txt",
-            "include_extensions": [".py", ".js"]
-        }
-        config_file.write_text(json.dumps(config_data))
+        config_file.write_text(_CONFIG_PY_JS)
         
         result = load_config_file(config_file)
         assert result["header_file"] == "HEADER.txt"
         assert result["include_extensions"] == [".py", ".js"]
     
+    def test_load_config_cache(self, tmp_path):
+        """Test that cached config data is copied and refreshed when the file changes."""
+        config_file = tmp_path / "config.json"
+        config_file.write_text(_CONFIG_EXT_PY)
+        
+        first = load_config_file(config_file)
+        first["include_extensions"].append(".js")
+        assert load_config_file(config_file) == {"include_extensions": [".py"]}
+        
+        config_file.write_text(_CONFIG_EXT_PY_TS)
+        assert load_config_file(config_file) == {"include_extensions": [".py", ".ts"]}
+    
     def test_load_nonexistent_config(self, tmp_path):
         """Test loading a non-existent config file."""
         config_file = tmp_path / "nonexistent.json"
@@ -109,18 +145,16 @@ class TestLoadHeaderContent:
     
     def test_load_existing_header(self, tmp_path):
         """Test loading an existing header file."""
-        header_file = tmp_path / "HEADER.txt"
         header_content = "# Copyright 2025\n"
-        header_file.write_text(header_content)
+        header_file = _make_header(tmp_path, header_content)
         
         result = load_header_content(str(header_file), tmp_path)
         assert result == header_content
     
     def test_load_relative_header(self, tmp_path):
         """Test loading a header file with relative path."""
-        header_file = tmp_path / "HEADER.txt"
         header_content = "# License\n"
-        header_file.write_text(header_content)
+        _make_header(tmp_path, header_content)
         
         result = load_header_content("HEADER.txt", tmp_path)
         assert result == header_content
@@ -134,9 +168,8 @@ class TestLoadHeaderContent:
     def test_load_header_outside_repo(self, tmp_path):
         """Test loading a header file outside the repo with absolute path."""
         # Create a header file outside the repo
-        outside_path = tmp_path.parent / "outside.txt"
         outside_content = "# Absolute Path Header\n"
-        outside_path.write_text(outside_content)
+        outside_path = _make_header(tmp_path.parent, outside_content, "outside.txt")
         
         # Absolute paths should be allowed for header files
         result = load_header_content(str(outside_path), tmp_path)
@@ -151,9 +184,8 @@ class TestLoadHeaderContent:
     
     def test_load_header_without_newline(self, tmp_path):
         """Test loading a header file without trailing newline."""
-        header_file = tmp_path / "HEADER.txt"
         header_content = "# Copyright 2025"  # No newline
-        header_file.write_text(header_content)
+        header_file = _make_header(tmp_path, header_content)
         
         result = load_header_content(str(header_file), tmp_path)
         assert result == header_content
@@ -162,11 +194,9 @@ class TestLoadHeaderContent:
 class TestMergeConfig:
     """Test merge_config function."""
     
-    def test_merge_with_cli_only(self, tmp_path):
+    def test_merge_with_cli_only(self, base_repo):
         """Test merging config with only CLI args."""
-        # Create header file
-        header_file = tmp_path / "HEADER.txt"
-        header_file.write_text("# Header\n")
+        header_file = base_repo / "HEADER.txt"
         
         cli_args = {
             'header': str(header_file),
@@ -174,24 +204,18 @@ class TestMergeConfig:
             'dry_run': True,
         }
         
-        config = merge_config(cli_args, repo_root=tmp_path)
+        config = merge_config(cli_args, repo_root=base_repo)
         assert config.header_file == str(header_file)
         assert config.dry_run is True
     
-    def test_merge_with_config_file(self, tmp_path):
+    def test_merge_with_config_file(self, tmp_path, base_repo):
         """Test merging config with config file."""
-        # Create header file
-        header_file = tmp_path / "HEADER.txt"
-        header_file.write_text("# Header\n")
+        # Share the header file with base_repo
+        os.link(base_repo / "HEADER.txt", tmp_path / "HEADER.txt")
         
         # Create config file
         config_file = tmp_path / "config.json"
-        config_data = {
-            "header_file": "HEADER.txt",
-            "include_extensions": [".py"],
-            "exclude_paths": ["dist"]
-        }
-        config_file.write_text(json.dumps(config_data))
+        config_file.write_text(_CONFIG_PY_DIST)
         
         cli_args = {}
         
@@ -210,11 +234,7 @@ class TestMergeConfig:
         
         # Create config file
         config_file = tmp_path / "config.json"
-        config_data = {
-            "header_file": "HEADER1.txt",
-            "include_extensions": [".py"],
-        }
-        config_file.write_text(json.dumps(config_data))
+        config_file.write_text(_CONFIG_HEADER1_PY)
         
         cli_args = {
             'header': "HEADER2.txt",
@@ -225,90 +245,87 @@ class TestMergeConfig:
         assert config.header_file == "HEADER2.txt"
         assert config.include_extensions == [".js", ".ts"]
     
-    def test_merge_missing_header_file(self, tmp_path):
-        """Test merging config without header file raises error."""
-        cli_args = {}
+    def test_merge_jobs_from_config_file(self, tmp_path, base_repo):
+        """Test that jobs is read from the config file and can be overridden by CLI."""
+        os.link(base_repo / "HEADER.txt", tmp_path / "HEADER.txt")
         
-        with pytest.raises(ClickException) as exc_info:
-            merge_config(cli_args, repo_root=tmp_path)
-        assert "Header file is required" in str(exc_info.value)
-    
-    def test_merge_with_default_config_file(self, tmp_path):
-        """Test merging config with default config file."""
-        # Create header file
-        header_file = tmp_path / "HEADER.txt"
-        header_file.write_text("# Header\n")
-        
-        # Create default config file
-        config_file = tmp_path / "license-header.config.json"
-        config_data = {
-            "header_file": "HEADER.txt",
-        }
-        config_file.write_text(json.dumps(config_data))
+        config_file = tmp_path / "config.json"
+        config_file.write_text(_CONFIG_JOBS)
         
-        cli_args = {}
+        config = merge_config({}, config_file_path=str(config_file), repo_root=tmp_path)
+        assert config.jobs == 4
         
-        config = merge_config(cli_args, repo_root=tmp_path)
-        assert config.header_file == "HEADER.txt"
+        config = merge_config({'jobs': 2}, config_file_path=str(config_file), repo_root=tmp_path)
+        assert config.jobs == 2
     
-    def test_merge_with_default_license_header(self, tmp_path):
-        """Test merging config with default LICENSE_HEADER file."""
-        # Create default LICENSE_HEADER file
-        header_file = tmp_path / "LICENSE_HEADER"
-        header_content = "# Default Header\n"
-        header_file.write_text(header_content)
-        
-        cli_args = {}
+    def test_merge_invalid_jobs(self, base_repo):
+        """Test that a non-positive jobs value is rejected."""
+        header_file = base_repo / "HEADER.txt"
         
-        config = merge_config(cli_args, repo_root=tmp_path)
-        assert config.header_file == "LICENSE_HEADER"
-        # Verify content was loaded
-        assert get_header_content(config) == header_content
+        with pytest.raises(ClickException) as exc_info:
+            merge_config({'header': str(header_file), 'jobs': 0}, repo_root=base_repo)
+        assert "Invalid jobs value" in str(exc_info.value)
     
-    def test_merge_cli_overrides_default_license_header(self, tmp_path):
-        """Test that CLI header flag overrides default LICENSE_HEADER."""
-        # Create both default and custom header files
-        default_header = tmp_path / "LICENSE_HEADER"
-        default_header.write_text("# Default\n")
+    def test_merge_trust_extensions(self, tmp_path, base_repo):
+        """Test that trust_extensions defaults to False and is read from the config file."""
+        os.link(base_repo / "HEADER.txt", tmp_path / "HEADER.txt")
         
-        custom_header = tmp_path / "CUSTOM.txt"
-        custom_header.write_text("# Custom\n")
+        config = merge_config({'header': "HEADER.txt"}, repo_root=tmp_path)
+        assert config.trust_extensions is False
         
-        cli_args = {'header': 'CUSTOM.txt'}
-        
-        config = merge_config(cli_args, repo_root=tmp_path)
-        assert config.header_file == "CUSTOM.txt"
-    
-    def test_merge_config_file_overrides_default_license_header(self, tmp_path):
-        """Test that config file header overrides default LICENSE_HEADER."""
-        # Create both default header and custom header
-        default_header = tmp_path / "LICENSE_HEADER"
-        default_header.write_text("# Default\n")
-        
-        custom_header = tmp_path / "CUSTOM.txt"
-        custom_header.write_text("# Custom\n")
+        config_file = tmp_path / "config.json"
+        config_file.write_text(_CONFIG_TRUST)
         
-        # Create config file
-        config_file = tmp_path / "license-header.config.json"
-        config_data = {"header_file": "CUSTOM.txt"}
-        config_file.write_text(json.dumps(config_data))
+        config = merge_config({}, config_file_path=str(config_file), repo_root=tmp_path)
+        assert config.trust_extensions is True
         
+        with pytest.raises(ClickException) as exc_info:
+            merge_config({'header': "HEADER.txt", 'trust_extensions': "yes"}, repo_root=tmp_path)
+        assert "Invalid trust_extensions value" in str(exc_info.value)
+    
+    def test_merge_missing_header_file(self, tmp_path):
+        """Test merging config without header file raises error."""
         cli_args = {}
         
+        with pytest.raises(ClickException) as exc_info:
+            merge_config(cli_args, repo_root=tmp_path)
+        assert "Header file is required" in str(exc_info.value)
+    
+    @pytest.mark.parametrize("files,cli_args,expected_header", [
+        pytest.param(
+            {"HEADER.txt": "# Header\n", "license-header.config.json": _CONFIG_HEADER},
+            {}, "HEADER.txt", id="default_config_file",
+        ),
+        pytest.param(
+            {"LICENSE_HEADER": "# Default Header\n"},
+            {}, "LICENSE_HEADER", id="default_license_header",
+        ),
+        pytest.param(
+            {"LICENSE_HEADER": "# Default\n", "CUSTOM.txt": "# Custom\n"},
+            {'header': 'CUSTOM.txt'}, "CUSTOM.txt", id="cli_overrides_default_license_header",
+        ),
+        pytest.param(
+            {"LICENSE_HEADER": "# Default\n", "CUSTOM.txt": "# Custom\n", "license-header.config.json": _CONFIG_CUSTOM},
+            {}, "CUSTOM.txt", id="config_file_overrides_default_license_header",
+        ),
+    ])
+    def test_merge_header_resolution(self, tmp_path, files, cli_args, expected_header):
+        """Test which header file is picked from CLI args, default config file and LICENSE_HEADER."""
+        for name, content in files.items():
+            _make_header(tmp_path, content, name)
+        
         config = merge_config(cli_args, repo_root=tmp_path)
-        assert config.header_file == "CUSTOM.txt"
+        assert config.header_file == expected_header
+        # Verify content was loaded
+        assert get_header_content(config) == files[expected_header]
     
-    def test_merge_config_path_outside_repo_rejected(self, tmp_path):
+    def test_merge_config_path_outside_repo_rejected(self, base_repo):
         """Test that config file paths escaping repo root are rejected."""
-        # Create header file
-        header_file = tmp_path / "HEADER.txt"
-        header_file.write_text("# Header\n")
-        
         # Try to use a relative config path that escapes the repo
         cli_args = {}
         
         with pytest.raises(ClickException) as exc_info:
-            merge_config(cli_args, config_file_path="../outside_config.json", repo_root=tmp_path)
+            merge_config(cli_args, config_file_path="../outside_config.json", repo_root=base_repo)
         assert "Configuration file path" in str(exc_info.value)
         assert "traverses above repository root" in str(exc_info.value)
 
@@ -318,9 +335,8 @@ class TestGetHeaderContent:
     
     def test_get_header_content(self, tmp_path):
         """Test getting header content from config."""
-        header_file = tmp_path / "HEADER.txt"
         header_content = "# Copyright\n"
-        header_file.write_text(header_content)
+        header_file = _make_header(tmp_path, header_content)
         
         cli_args = {'header': str(header_file)}
         config = merge_config(cli_args, repo_root=tmp_path)
@@ -34,6 +34,13 @@ class TestFormatFileList:
         result = _format_file_list(files, repo_root)
         assert result == ['src/a.py', 'test/b.py']
     
+    def test_format_outside_repo_root(self):
+        """Test that files outside the repo root keep their full path."""
+        repo_root = Path('/tmp/project')
+        files = [Path('/tmp/project2/a.py'), Path('/tmp/other/b.py'), Path('/tmp/project')]
+        result = _format_file_list(files, repo_root)
+        assert result == [str(files[0]), str(files[1]), '.']
+    
     def test_format_with_limit(self):
         """Test formatting file list with limit."""
         files = [Path(f'/tmp/file{i}.py') for i in range(10)]
@@ -12,9 +12,57 @@ from license_header.scanner import (
     matches_exclude_pattern,
     scan_repository,
     DEFAULT_EXCLUDE_DIRS,
+    _walk,
 )
 
 
+def _make_tree(root, files):
+    """Create files (mapping relative path to content) under root."""
+    for rel_path, content in files.items():
+        file_path = root / rel_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(content)
+    return root
+
+
+# Basic repository structure: Python sources plus non-Python files
+_BASIC_REPO_FILES = {
+    "src/main.py": "print('main')\n",
+    "src/utils.py": "def util(): pass\n",
+    "tests/test_main.py": "def test(): pass\n",
+    "README.md": "# README\n",
+    "docs/guide.txt": "Guide\n",
+}
+
+
+@pytest.fixture(scope="module")
+def basic_repo(tmp_path_factory):
+    """Basic repository tree, shared by scans that don't modify it."""
+    return _make_tree(tmp_path_factory.mktemp("basic"), _BASIC_REPO_FILES)
+
+
+@pytest.fixture(scope="module")
+def default_excludes_repo(tmp_path_factory):
+    """Tree with a file in each common default exclude directory and in src."""
+    files = {f"{dirname}/file.py": "content\n" for dirname in ['.git', '.venv', 'node_modules', 'dist', 'build']}
+    files["src/main.py"] = "content\n"
+    return _make_tree(tmp_path_factory.mktemp("excludes"), files)
+
+
+@pytest.fixture(scope="module")
+def glob_patterns_repo(tmp_path_factory):
+    """Tree with files to be excluded by glob patterns and files in src to keep."""
+    return _make_tree(tmp_path_factory.mktemp("globs"), {
+        "generated/output.py": "# generated\n",
+        "generated/data.py": "# generated\n",
+        "file.pyc": "compiled\n",
+        "src/temp.pyc": "compiled\n",
+        "vendor/lib.py": "# vendor\n",
+        "src/main.py": "# main\n",
+        "src/utils.py": "# utils\n",
+    })
+
+
 class TestScanResult:
     """Test ScanResult dataclass."""
     
@@ -69,7 +117,17 @@ class TestIsBinaryFile:
         mixed_file.write_bytes(b'Some text\x00more text')
         
         assert is_binary_file(mixed_file)
-    
+
+    def test_only_first_chunk_is_checked(self, tmp_path):
+        """Test that null bytes past the first 8KB do not make a file binary."""
+        boundary_file = tmp_path / "boundary.dat"
+        boundary_file.write_bytes(b'a' * 8191 + b'\x00')
+        assert is_binary_file(boundary_file)
+
+        large_file = tmp_path / "large.dat"
+        large_file.write_bytes(b'a' * 8192 + b'\x00' + b'b' * (1 << 20))
+        assert not is_binary_file(large_file)
+
     def test_nonexistent_file(self, tmp_path):
         """Test that nonexistent files are treated as binary."""
         nonexistent = tmp_path / "nonexistent.txt"
@@ -168,6 +226,31 @@ class TestMatchesExcludePattern:
         assert not matches_exclude_pattern(no_match_1, tmp_path, patterns)
         assert not matches_exclude_pattern(no_match_2, tmp_path, patterns)
     
+    def test_glob_wildcards_stay_within_one_component(self, tmp_path):
+        """Test that '*', '?' and character sets never match across directories."""
+        assert matches_exclude_pattern(tmp_path / "src" / "abc.py", tmp_path, ["a*"])
+        assert not matches_exclude_pattern(tmp_path / "a" / "b" / "c.py", tmp_path, ["a*c.py"])
+        assert not matches_exclude_pattern(tmp_path / "a" / "b.py", tmp_path, ["a?b.py"])
+        assert not matches_exclude_pattern(tmp_path / "a" / "b.py", tmp_path, ["a[!x]b.py"])
+        assert matches_exclude_pattern(tmp_path / "src" / "a-b.py", tmp_path, ["a[!x]b.py"])
+    
+    @pytest.mark.skipif(os.name == 'nt', reason="Newlines are not allowed in Windows file names")
+    def test_patterns_anchor_at_end_of_name(self, tmp_path):
+        """Test that a trailing newline in a file name is not ignored by matching."""
+        assert not matches_exclude_pattern(tmp_path / "module.pyc\n", tmp_path, ["*.pyc"])
+        assert not matches_exclude_pattern(tmp_path / "vendor\n" / "a.js", tmp_path, ["vendor"])
+    
+    def test_literal_names_match_whole_components(self, tmp_path):
+        """Test that a name without wildcards only matches an identical path component."""
+        patterns = ["lib.d"]
+        
+        assert matches_exclude_pattern(tmp_path / "lib.d" / "x.py", tmp_path, patterns)
+        assert matches_exclude_pattern(tmp_path / "src" / "lib.d" / "sub" / "x.py", tmp_path, patterns)
+        assert matches_exclude_pattern(tmp_path / "src" / "lib.d", tmp_path, patterns)
+        assert not matches_exclude_pattern(tmp_path / "src" / "libxd" / "x.py", tmp_path, patterns)
+        assert not matches_exclude_pattern(tmp_path / "src" / "my-lib.d" / "x.py", tmp_path, patterns)
+        assert not matches_exclude_pattern(tmp_path / "src" / "lib.d.py", tmp_path, patterns)
+    
     def test_glob_and_simple_patterns_mixed(self, tmp_path):
         """Test mixing glob patterns with simple directory names."""
         patterns = ["node_modules", "*.pyc", "generated/*.py"]
@@ -194,33 +277,13 @@ class TestMatchesExcludePattern:
 class TestScanRepository:
     """Test scan_repository function."""
     
-    def setup_basic_repo(self, tmp_path):
-        """Create a basic repository structure for testing."""
-        # Create directory structure
-        (tmp_path / "src").mkdir()
-        (tmp_path / "tests").mkdir()
-        (tmp_path / "docs").mkdir()
-        
-        # Create Python files
-        (tmp_path / "src" / "main.py").write_text("print('main')\n")
-        (tmp_path / "src" / "utils.py").write_text("def util(): pass\n")
-        (tmp_path / "tests" / "test_main.py").write_text("def test(): pass\n")
-        
-        # Create non-Python files
-        (tmp_path / "README.md").write_text("# README\n")
-        (tmp_path / "docs" / "guide.txt").write_text("Guide\n")
-        
-        return tmp_path
-    
-    def test_basic_scan(self, tmp_path):
+    def test_basic_scan(self, basic_repo):
         """Test basic repository scanning."""
-        repo = self.setup_basic_repo(tmp_path)
-        
         result = scan_repository(
-            root_path=repo,
+            root_path=basic_repo,
             include_extensions=['.py'],
             exclude_patterns=[],
-            repo_root=repo,
+            repo_root=basic_repo,
         )
         
         # Should find 3 Python files
@@ -249,23 +312,13 @@ class TestScanRepository:
         assert len(result.eligible_files) == 3
         assert len(result.skipped_extension) == 1
     
-    def test_default_excludes(self, tmp_path):
+    def test_default_excludes(self, default_excludes_repo):
         """Test that default exclude directories are skipped."""
-        # Create default exclude directories
-        for dirname in ['.git', '.venv', 'node_modules', 'dist', 'build']:
-            dir_path = tmp_path / dirname
-            dir_path.mkdir()
-            (dir_path / "file.py").write_text("content\n")
-        
-        # Create a normal directory
-        (tmp_path / "src").mkdir()
-        (tmp_path / "src" / "main.py").write_text("content\n")
-        
         result = scan_repository(
-            root_path=tmp_path,
+            root_path=default_excludes_repo,
             include_extensions=['.py'],
             exclude_patterns=[],
-            repo_root=tmp_path,
+            repo_root=default_excludes_repo,
         )
         
         # Should only find the file in src
@@ -289,29 +342,13 @@ class TestScanRepository:
         assert len(result.eligible_files) == 1
         assert 'include/file.py' in str(result.eligible_files[0])
     
-    def test_glob_patterns_in_scan(self, tmp_path):
+    def test_glob_patterns_in_scan(self, glob_patterns_repo):
         """Test that glob patterns work in repository scanning."""
-        # Create directory structure
-        (tmp_path / "src").mkdir()
-        (tmp_path / "generated").mkdir()
-        (tmp_path / "vendor").mkdir()
-        
-        # Create files that should be excluded by glob patterns
-        (tmp_path / "generated" / "output.py").write_text("# generated\n")
-        (tmp_path / "generated" / "data.py").write_text("# generated\n")
-        (tmp_path / "file.pyc").write_text("compiled\n")
-        (tmp_path / "src" / "temp.pyc").write_text("compiled\n")
-        (tmp_path / "vendor" / "lib.py").write_text("# vendor\n")
-        
-        # Create files that should be included
-        (tmp_path / "src" / "main.py").write_text("# main\n")
-        (tmp_path / "src" / "utils.py").write_text("# utils\n")
-        
         result = scan_repository(
-            root_path=tmp_path,
+            root_path=glob_patterns_repo,
             include_extensions=['.py', '.pyc'],
             exclude_patterns=["generated/*.py", "*.pyc", "**/vendor"],
-            repo_root=tmp_path,
+            repo_root=glob_patterns_repo,
         )
         
         # Should only find the files in src, not in generated or vendor, and not .pyc files
@@ -366,6 +403,23 @@ class TestScanRepository:
         assert len(result.skipped_binary) == 1
         assert 'binary.py' in str(result.skipped_binary[0])
     
+    def test_trust_extensions_skips_binary_detection(self, tmp_path):
+        """Test that trusted text extensions are not checked for binary content."""
+        (tmp_path / "binary.py").write_bytes(b'\x00\x01\x02\x03binary content')
+        (tmp_path / "binary.dat").write_bytes(b'\x00\x01\x02\x03binary content')
+        
+        result = scan_repository(
+            root_path=tmp_path,
+            include_extensions=['.py', '.dat'],
+            exclude_patterns=[],
+            repo_root=tmp_path,
+            trust_extensions=True,
+        )
+        
+        # Only the well-known text extension is trusted
+        assert [f.name for f in result.eligible_files] == ['binary.py']
+        assert [f.name for f in result.skipped_binary] == ['binary.dat']
+    
     def test_symlink_avoidance(self, tmp_path):
         """Test that symlinks are skipped."""
         # Create a real file
@@ -413,6 +467,15 @@ class TestScanRepository:
         # Count occurrences - should only appear once in the path
         assert file_path.count('file.py') == 1
     
+    def test_walk_skips_symlinked_directories_on_its_own(self, tmp_path):
+        """Test that the walk itself never enters symlinked directories, whatever the caller checks."""
+        (tmp_path / "real_dir" / "nested").mkdir(parents=True)
+        (tmp_path / "link_dir").symlink_to(tmp_path / "real_dir")
+        
+        # Consume the walk without touching any entry
+        visited = sorted(rel_dir for _, rel_dir, _, _, _ in _walk(os.fspath(tmp_path), ''))
+        assert visited == ['', 'real_dir', 'real_dir/nested']
+    
     def test_deterministic_ordering(self, tmp_path):
         """Test that results are sorted deterministically."""
         # Create files in random order
@@ -432,6 +495,26 @@ class TestScanRepository:
         assert filenames == sorted(filenames)
         assert filenames == ['apple.py', 'banana.py', 'middle.py', 'zebra.py']
     
+    def test_parallel_walk_matches_sequential(self, tmp_path):
+        """Test that listing directories in parallel gives the same result."""
+        _make_tree(tmp_path, _BASIC_REPO_FILES)
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "dep.py").write_text("content\n")
+        (tmp_path / "src" / "pkg" / "sub").mkdir(parents=True)
+        (tmp_path / "src" / "pkg" / "sub" / "inner.py").write_text("content\n")
+        (tmp_path / "src" / "data.bin.py").write_bytes(b'\x00\x01')
+        
+        def scan(jobs):
+            return scan_repository(
+                root_path=tmp_path,
+                include_extensions=['.py'],
+                exclude_patterns=['tests'],
+                repo_root=tmp_path,
+                jobs=jobs,
+            )
+        
+        assert scan(4) == scan(1)
+    
     def test_deep_directory_tree(self, tmp_path):
         """Test that deep directory trees are handled without recursion issues."""
         # Create a deep directory tree
@@ -454,7 +537,8 @@ class TestScanRepository:
         assert len(result.eligible_files) == 1
         assert 'deep.py' in str(result.eligible_files[0])
     
-    def test_case_insensitive_extensions(self, tmp_path):
+    @pytest.mark.parametrize("include_extensions", [['.py'], ['.PY'], ['.pY']])
+    def test_case_insensitive_extensions(self, tmp_path, include_extensions):
         """Test that file extensions are matched case-insensitively."""
         (tmp_path / "lower.py").write_text("content\n")
         (tmp_path / "upper.PY").write_text("content\n")
@@ -462,7 +546,7 @@ class TestScanRepository:
         
         result = scan_repository(
             root_path=tmp_path,
-            include_extensions=['.py'],
+            include_extensions=include_extensions,
             exclude_patterns=[],
             repo_root=tmp_path,
         )